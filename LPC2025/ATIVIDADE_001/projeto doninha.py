@@ -1,5 +1,12 @@
 # Library used.
+import argparse
+import multiprocessing
+import os
 import random
+import time
+from pathlib import Path
+
+import numpy as np
 
 # The phrase that the program has to achieve.
 target_phrase = "METHINKS IT IS LIKE A WEASEL"
@@ -13,6 +20,17 @@ copies = 100
 # The mutation rate.
 mutation_rate = 5  # 5%
 
+# Engine used by the main loop: "python" (one character at a time)
+# or "numpy" (the whole generation at once, for long phrases
+# and large copies values) or "islands" (several numpy populations,
+# one per core, that share their best phrase from time to time).
+engine = "numpy"
+
+# Island model: how many populations and how many generations
+# each one runs between two migrations.
+islands = os.cpu_count() or 1
+migration_interval = 20
+
 # Defs and functions on the program
 
 
@@ -55,6 +73,108 @@ def assessment_of_phrase(phrase):
     return position_number
 
 
+# Vectorized engine: the phrases become uint8 arrays (one byte per
+# character), so a whole generation is a (copies x length) matrix.
+
+
+def encode_phrase(phrase, size=None):
+    # Turns a phrase into an array of character codes.
+    # Bytes are used as they are (no copy); a string is encoded
+    # as UTF-8, so a character outside ASCII takes several codes.
+    # With a size, the codes are fitted to it (see fit_phrase).
+    if isinstance(phrase, str):
+        phrase = phrase.encode("utf-8")
+    if size is not None:
+        phrase = fit_phrase(phrase, size)
+    return np.frombuffer(phrase, dtype=np.uint8)
+
+
+def decode_phrase(codes):
+    # Turns an array of character codes back into a phrase.
+    return bytes(codes).decode("utf-8", "replace")
+
+
+def load_target(path):
+    # Reads a target of any size from a file, as raw bytes.
+    return Path(path).read_bytes().rstrip(b"\r\n")
+
+
+def derive_alphabet(target):
+    # The permited characters of a target are the bytes it uses.
+    return np.unique(encode_phrase(target))
+
+
+# The target and the permited characters, already encoded.
+target_codes = encode_phrase(target_phrase)
+character_codes = encode_phrase(possible_characters)
+
+
+def assess_generation(generation, goal=None):
+
+    # Scores every copy at once: the number of characters
+    # in the correct position, one value per row.
+    # goal is the encoded target, target_codes by default.
+    if goal is None:
+        goal = target_codes
+    return np.count_nonzero(generation == goal, axis=1)
+
+
+# Incremental fitness: a child only differs from its father in the
+# mutated positions, so its fitness is the father's fitness plus the
+# change in those positions. The generation matrix is never built.
+
+
+def mutation_changes(father, rng, quantity=None, rate=None, alphabet=None):
+
+    # Draws the mutations of a whole generation without copying the father.
+    # Returns three arrays with one entry per mutation: the copy (row),
+    # the position (column) and the new character code.
+    if quantity is None:
+        quantity = copies
+    if rate is None:
+        rate = mutation_rate
+    if alphabet is None:
+        alphabet = character_codes
+    size = len(father)
+    total = rng.binomial(quantity * size, rate / 100)
+    # Repeated draws of the same cell count only once.
+    cells = np.unique(rng.integers(0, quantity * size, total))
+    rows, columns = np.divmod(cells, size)
+    new_characters = alphabet[rng.integers(0, len(alphabet), len(cells))]
+    return rows, columns, new_characters
+
+
+def fitness_delta(father, changes, quantity=None, goal=None):
+
+    # Fitness-delta API: how much each copy gained or lost
+    # against its father, looking only at the changed positions.
+    if quantity is None:
+        quantity = copies
+    if goal is None:
+        goal = target_codes
+    rows, columns, new_characters = changes
+    expected = goal[columns]
+    delta = (new_characters == expected).astype(np.int64) \
+        - (father[columns] == expected)
+    return np.bincount(rows, weights=delta, minlength=quantity).astype(np.int64)
+
+
+def build_child(father, changes, row):
+    # Applies to the father only the mutations of one copy.
+    rows, columns, new_characters = changes
+    child = father.copy()
+    mine = rows == row
+    child[columns[mine]] = new_characters[mine]
+    return child
+
+
+def fit_phrase(phrase, size):
+    # The matrix needs every phrase with the same lenght of the target,
+    # so a short phrase is completed with spaces and a long one is cut.
+    # Works on strings and on bytes alike.
+    return phrase.ljust(size)[:size]
+
+
 # Main executionS
 def execute_simulation():
 
@@ -62,6 +182,8 @@ def execute_simulation():
     # executes the evolutionary cycle of the Doninha Program.
     # Create the first random sentence ("Generation 0").
     close_phrase = inicial_phrase(len(target_phrase))
+    if engine in ("numpy", "islands"):
+        close_phrase = fit_phrase(close_phrase, len(target_phrase))
     close_position = assessment_of_phrase(close_phrase)
     generation_counter = 0
 
@@ -76,6 +198,16 @@ def execute_simulation():
     )
     print("Phrase='{}'".format(close_phrase))
     # Main loop
+    if engine == "numpy":
+        execute_numpy_loop(close_phrase)
+        print("\n=== SIMULATION COMPLETE! ===")
+        return
+    if engine == "islands":
+        generations, seconds = execute_islands(close_phrase)
+        print(f"Generations: {generations}")
+        print(f"Wall time: {seconds:.2f}s")
+        print("\n=== SIMULATION COMPLETE! ===")
+        return
     while close_position < len(target_phrase):
         generation_counter += 1
         # Creates a list
@@ -100,12 +232,241 @@ def execute_simulation():
         print(f"Phrase: '{close_phrase}'")
     print("\n=== SIMULATION COMPLETE! ===")
 
+
+def evolve(phrase, goal=None, seed=None, quantity=None, rate=None,
+           alphabet=None):
+
+    # Generator of the evolutionary cycle: yields one record
+    # (generation, fitness, best) per generation, starting at
+    # generation 0, until the best phrase is the goal.
+    # best is the father as bytes, one byte per character.
+    if goal is None:
+        goal = target_codes
+    goal = encode_phrase(goal) if not isinstance(goal, np.ndarray) else goal
+    rng = seed if isinstance(seed, np.random.Generator) \
+        else np.random.default_rng(seed)
+    father = encode_phrase(phrase, len(goal))
+    fitness = int(assess_generation(father[None], goal)[0])
+    generation_counter = 0
+    yield generation_counter, fitness, father.tobytes()
+    while fitness < len(goal):
+        generation_counter += 1
+        changes = mutation_changes(father, rng, quantity, rate, alphabet)
+        positions = fitness + fitness_delta(father, changes, quantity, goal)
+
+        # The best copy only replaces the father if it is closer.
+        best = int(positions.argmax())
+        if positions[best] > fitness:
+            fitness = int(positions[best])
+            father = build_child(father, changes, best)
+        yield generation_counter, fitness, father.tobytes()
+
+
+def execute_numpy_loop(close_phrase, seed=None, goal=None,
+                       quantity=None, rate=None, progress=1, alphabet=None):
+
+    # Same evolutionary cycle as execute_simulation,
+    # but each generation is mutated and scored in one go.
+    # The progress is printed every "progress" generations
+    # (0 prints nothing).
+    if goal is None:
+        goal = target_codes
+    goal = encode_phrase(goal) if not isinstance(goal, np.ndarray) else goal
+    generation_counter = 0
+    for generation_counter, close_position, best in evolve(
+            close_phrase, goal, seed, quantity, rate, alphabet):
+        # Print the progress
+        if progress and generation_counter \
+                and generation_counter % progress == 0:
+            print(f"Generation: {generation_counter}")
+            print(f"Position Number: {close_position}/{len(goal)}")
+            print(f"Phrase: '{decode_phrase(best)}'")
+    return generation_counter
+
+
+def batch_simulation(phrase=None, seed=None, target=None, quantity=None,
+                     rate=None, progress=0, alphabet=None, engine=None,
+                     number_of_islands=None, interval=None):
+
+    # Runs one simulation without asking anything to the user.
+    # Without a phrase, generation 0 is a random one.
+    # engine is "numpy" (the default) or "islands"; the islands
+    # print nothing, whatever "progress" is.
+    # Returns the generations until the target and the wall time.
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    if target is None:
+        target = target_phrase
+    if alphabet is None:
+        alphabet = character_codes
+    goal = encode_phrase(target)
+    if phrase is None:
+        father = alphabet[rng.integers(0, len(alphabet), len(goal))]
+    else:
+        father = encode_phrase(phrase, len(goal))
+    if engine == "islands":
+        generations, _ = execute_islands(father.tobytes(), seed,
+                                         number_of_islands, interval,
+                                         quantity, rate, goal, alphabet)
+        return generations, time.perf_counter() - start
+    generations = execute_numpy_loop(father.tobytes(), rng, goal,
+                                     quantity, rate, progress, alphabet)
+    return generations, time.perf_counter() - start
+
+
+def run_trials(trials, seed=None, **parameters):
+
+    # Runs "trials" batch simulations, each with its own seed,
+    # and returns the aggregate statistics of generations and time.
+    seeds = np.random.SeedSequence(seed).spawn(trials)
+    runs = np.array([batch_simulation(seed=s, **parameters) for s in seeds])
+    generations, seconds = runs[:, 0], runs[:, 1]
+    return {
+        "trials": trials,
+        "generations_mean": float(generations.mean()),
+        "generations_p50": float(np.percentile(generations, 50)),
+        "generations_p90": float(np.percentile(generations, 90)),
+        "generations_max": int(generations.max()),
+        "seconds_mean": float(seconds.mean()),
+        "seconds_p90": float(np.percentile(seconds, 90)),
+        "seconds_total": float(seconds.sum()),
+    }
+
+
+def evolve_island(island):
+
+    # Runs one island for up to "generations" generations without
+    # printing, and returns it with the new father and position.
+    # The island is a tuple so it can travel between processes.
+    father, position, rng, generations, quantity, rate, goal, alphabet = island
+    ran = 0
+    while ran < generations and position < len(goal):
+        ran += 1
+        changes = mutation_changes(father, rng, quantity, rate, alphabet)
+        positions = position + fitness_delta(father, changes, quantity, goal)
+        best = int(positions.argmax())
+        if positions[best] > position:
+            position = int(positions[best])
+            father = build_child(father, changes, best)
+    return father, position, rng, ran
+
+
+def execute_islands(close_phrase, seed=None, number_of_islands=None,
+                    interval=None, quantity=None, rate=None, goal=None,
+                    alphabet=None):
+
+    # Island model: every island is a numpy lineage in its own process.
+    # After each interval the best phrase of all islands migrates
+    # to the others, replacing their father.
+    # goal and alphabet work as in execute_numpy_loop; seed may also
+    # be a SeedSequence, which the islands are spawned from.
+    # Returns the generations until convergence and the wall time.
+    if number_of_islands is None:
+        number_of_islands = islands
+    if interval is None:
+        interval = migration_interval
+    if quantity is None:
+        quantity = copies
+    if rate is None:
+        rate = mutation_rate
+    if goal is None:
+        goal = target_codes
+    goal = encode_phrase(goal) if not isinstance(goal, np.ndarray) else goal
+    if alphabet is None:
+        alphabet = character_codes
+    start = time.perf_counter()
+    father = encode_phrase(close_phrase, len(goal))
+    position = int(assess_generation(father[None], goal)[0])
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(number_of_islands)
+    population = [[father, position, np.random.default_rng(s)]
+                  for s in seeds]
+    generation_counter = 0
+    with multiprocessing.Pool(min(number_of_islands, os.cpu_count() or 1)) as pool:
+        while position < len(goal):
+            jobs = [(f, p, g, interval, quantity, rate, goal, alphabet)
+                    for f, p, g in population]
+            results = pool.map(evolve_island, jobs)
+            # The island that converged first decides the generations.
+            generation_counter += min(
+                (ran for _, p, _, ran in results if p == len(goal)),
+                default=interval,
+            )
+            population = [[f, p, g] for f, p, g, _ in results]
+
+            # Migration of the best phrase.
+            best = max(population, key=lambda island: island[1])
+            father, position = best[0], best[1]
+            for island in population:
+                if island[1] < position:
+                    island[0], island[1] = father, position
+    return generation_counter, time.perf_counter() - start
+
 # =========ENTRANCE OF THE PROGRAM=========
 # Ensures that the function execute_simulation()
 # is called when the file is executed.
 
 
+def parse_arguments():
+    # Without --batch the program keeps the interactive mode.
+    parser = argparse.ArgumentParser(description="Weasel program")
+    parser.add_argument("--batch", action="store_true",
+                        help="run without input() and print a summary")
+    parser.add_argument("--phrase", help="initial phrase (random if absent)")
+    parser.add_argument("--target",
+                        help="phrase to reach (the weasel phrase if absent); "
+                        "the permited characters become the ones it uses")
+    parser.add_argument("--target-file",
+                        help="read the target from a file; the permited "
+                        "characters become the ones it uses")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--copies", type=int, default=copies)
+    parser.add_argument("--rate", type=float, default=mutation_rate)
+    parser.add_argument("--progress", type=int, default=0,
+                        help="print every N generations (0 = summary only)")
+    parser.add_argument("--trials", type=int, default=1)
+    parser.add_argument("--engine", choices=("numpy", "islands"),
+                        default="numpy",
+                        help="numpy lineage or island model "
+                        "(the islands ignore --progress)")
+    parser.add_argument("--islands", type=int, default=islands,
+                        help="number of islands (one process each)")
+    parser.add_argument("--interval", type=int, default=migration_interval,
+                        help="generations between migrations")
+    return parser.parse_args()
+
+
+def execute_batch(arguments):
+    # Runs the trials and prints only the aggregate statistics.
+    target = arguments.target
+    if arguments.target_file:
+        target = load_target(arguments.target_file)
+    # A chosen target brings its own permited characters.
+    if target is None:
+        target, alphabet = target_phrase, None
+    else:
+        alphabet = derive_alphabet(target)
+    stats = run_trials(arguments.trials, arguments.seed,
+                       phrase=arguments.phrase, target=target,
+                       quantity=arguments.copies, rate=arguments.rate,
+                       progress=arguments.progress, alphabet=alphabet,
+                       engine=arguments.engine,
+                       number_of_islands=arguments.islands,
+                       interval=arguments.interval)
+    print(f"Trials: {stats['trials']}")
+    print("Generations: mean {:.1f}, p50 {:.0f}, p90 {:.0f}, max {}".format(
+        stats["generations_mean"], stats["generations_p50"],
+        stats["generations_p90"], stats["generations_max"]))
+    print("Wall time: mean {:.4f}s, p90 {:.4f}s, total {:.2f}s".format(
+        stats["seconds_mean"], stats["seconds_p90"], stats["seconds_total"]))
+
+
 if __name__ == "__main__":
-    execute_simulation()
+    arguments = parse_arguments()
+    if arguments.batch:
+        execute_batch(arguments)
+    else:
+        execute_simulation()
 
 #print("hello world")
@@ -1,6 +1,11 @@
 import pygame
 import random
 import os
+import csv
+import json
+import time
+from collections import deque
+from functools import lru_cache
 
 # Game Constants
 SCREEN_WIDTH = 800
@@ -92,11 +97,100 @@ class Block(pygame.sprite.Sprite):
         self.row = row
 
 
+# Frame Profiler
+class FrameProfiler:
+    # Times the phases of each frame and keeps rolling statistics.
+    # Call begin() at the top of the frame, lap(phase) after every
+    # phase and end() before waiting for the next frame.
+
+    PHASES = ("input", "update", "collision", "draw", "flip")
+
+    def __init__(self, window=600):
+        self.frames = deque(maxlen=window)
+        self.samples = {p: deque(maxlen=window) for p in self.PHASES}
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+        self.t0 = self.mark = time.perf_counter()
+        self.overlay = False
+
+    def begin(self):
+        self.t0 = self.mark = time.perf_counter()
+        for p in self.PHASES:
+            self.current[p] = 0.0
+
+    def lap(self, phase):
+        # Charge the time since the previous mark to the phase.
+        now = time.perf_counter()
+        self.current[phase] += (now - self.mark) * 1000.0
+        self.mark = now
+
+    def end(self):
+        self.frames.append((time.perf_counter() - self.t0) * 1000.0)
+        for p in self.PHASES:
+            self.samples[p].append(self.current[p])
+
+    @staticmethod
+    def percentile(values, q):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def stats(self):
+        # p50/p95/p99 frame time (ms) and mean ms of every phase.
+        return {
+            "frames": len(self.frames),
+            "p50": self.percentile(self.frames, 50),
+            "p95": self.percentile(self.frames, 95),
+            "p99": self.percentile(self.frames, 99),
+            "max": max(self.frames, default=0.0),
+            "phases": {
+                p: sum(s) / len(s) if s else 0.0
+                for p, s in self.samples.items()
+            },
+        }
+
+    def export(self, csv_path="profile.csv", json_path="profile.json"):
+        # Write one CSV row per frame and a JSON summary.
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame_ms",) + self.PHASES)
+            columns = [self.frames] + [self.samples[p] for p in self.PHASES]
+            for row in zip(*columns):
+                writer.writerow(f"{v:.4f}" for v in row)
+        with open(json_path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def draw(self, surface):
+        # Draw the statistics in the bottom-left corner.
+        if not self.overlay:
+            return
+        s = self.stats()
+        lines = [f"p50 {s['p50']:.1f}  p95 {s['p95']:.1f}  "
+                 f"p99 {s['p99']:.1f} ms"]
+        lines += [f"{p} {ms:.2f} ms" for p, ms in s["phases"].items()]
+        font = get_font(20)
+        y = surface.get_height() - 10 - font.get_linesize() * len(lines)
+        for text in lines:
+            surface.blit(font.render(text, True, WHITE, BLACK), (10, y))
+            y += font.get_linesize()
+
+
 # Utility Functions
+@lru_cache(maxsize=None)
+def get_font(size):
+    # Load the default font once per size.
+    return pygame.font.Font(None, size)
+
+
+@lru_cache(maxsize=128)
+def render_text(text, size, color):
+    # Render a text once and reuse it while it does not change.
+    return get_font(size).render(text, True, color)
+
+
 def draw_text(surface, text, size, x, y, color=WHITE):
     # Draw text on the screen.
-    font = pygame.font.Font(None, size)
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(text, size, color)
     text_rect = text_surface.get_rect(center=(x, y))
     surface.blit(text_surface, text_rect)
 
@@ -200,13 +294,21 @@ def main_game_loop():
     for b in blocks:
         all_sprites.add(b)
 
+    # frame profiler (F3 overlay, F4 export)
+    profiler = FrameProfiler()
+
     running = True
     while running:
+        profiler.begin()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
+                if event.key == pygame.K_F3:
+                    profiler.overlay = not profiler.overlay
+                elif event.key == pygame.K_F4:
+                    profiler.export()
+                elif event.key == pygame.K_SPACE:
                     if game_state == "MENU":
                         game_state = "PLAYING"
                         score = 0
@@ -229,9 +331,11 @@ def main_game_loop():
                 elif event.key == pygame.K_r and (game_state == "GAME_OVER"
                                                   or game_state == "WIN"):
                     game_state = "MENU"
+        profiler.lap("input")
 
         if game_state == "PLAYING":
             all_sprites.update()
+            profiler.lap("update")
 
             if ball.rect.bottom >= SCREEN_HEIGHT:
                 lives -= 1
@@ -290,6 +394,7 @@ def main_game_loop():
 
             if len(blocks) == 0:
                 game_state = "WIN"
+        profiler.lap("collision")
 
         # Drawing
         screen.fill(BLACK)
@@ -329,7 +434,11 @@ def main_game_loop():
             draw_text(screen, "Press 'R' to return to Menu", 24,
                       SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4)
 
+        profiler.draw(screen)
+        profiler.lap("draw")
         pygame.display.flip()
+        profiler.lap("flip")
+        profiler.end()
         clock.tick(FPS)
 
     pygame.quit()
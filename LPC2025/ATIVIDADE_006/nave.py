@@ -27,6 +27,22 @@ scale = (SHIP_SIZE * 2) / max(img_w, img_h)
 new_size = (max(1, int(img_w * scale)), max(1, int(img_h * scale)))
 ship_image = pygame.transform.smoothscale(img, new_size)
 
+# Rotation cache: one frame per degree, rendered the first time
+# that angle is drawn, stored with its rect.
+ROT_STEPS = 360
+rotated_frames = [None] * ROT_STEPS
+
+
+def rotated_ship(angle):
+    # Return (surface, rect) of the ship at the nearest cached angle.
+    step = round(angle * ROT_STEPS / 360.0) % ROT_STEPS
+    frame = rotated_frames[step]
+    if frame is None:
+        rotated = pygame.transform.rotate(ship_image, -step * 360.0 / ROT_STEPS)
+        frame = rotated_frames[step] = (rotated, rotated.get_rect())
+    return frame
+
+
 # Ship state variables
 x = WIDTH / 2
 y = HEIGHT / 2
@@ -97,9 +113,9 @@ while running:
         y -= HEIGHT
 
     screen.fill((10, 10, 30))
-    rotated = pygame.transform.rotate(ship_image, -angle)
-    rect = rotated.get_rect(center=(x, y))
-    screen.blit(rotated, rect.topleft)
+    rotated, rect = rotated_ship(angle)
+    rect.center = (x, y)
+    screen.blit(rotated, rect)
 
     pygame.display.flip()
 
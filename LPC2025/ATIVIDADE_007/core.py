@@ -1,5 +1,16 @@
-import pygame
+import csv
+import heapq
+import json
 import math
+import os
+import struct
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+import pygame
 
 
 # Screen and Clock Setup
@@ -21,27 +32,112 @@ def scoreboard_setup(width):
     return score_font, score1_pos, score2_pos
 
 
-# Image and Sound Loading
-def load_image(image_path_1, image_path_2):
-    # Load player and bullet images plus sound.
-    bullet_sound = pygame.mixer.Sound("assets/bullet.wav")
-    bullet = "assets/bullet.png"
-    image_1 = pygame.image.load(image_path_1).convert_alpha()
-    image_2 = pygame.image.load(image_path_2).convert_alpha()
-    bullet_image = pygame.image.load(bullet).convert_alpha()
-    return image_1, image_2, bullet_image, bullet_sound
+# Asset Manager
+def fit_size(size, longest):
+    # Size that keeps the proportions with the longest side = longest.
+    scale = longest / max(size)
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+class AssetManager:
+    # Loads every file once and keeps the converted surfaces.
+    # Scaled variants are memoized by (path, size), where size is a
+    # (w, h) tuple or an int for "longest side", and saved as raw RGBA
+    # in cache_dir so later startups skip both decode and smoothscale.
+    # preload() does the slow part on a background thread.
+
+    HEADER = struct.Struct("<II")
+
+    def __init__(self, cache_dir="assets/.cache"):
+        self.cache_dir = cache_dir
+        self.images = {}
+        self.sounds = {}
+        self.loaded = {}  # raw surfaces from the preload thread
+        self.thread = None
+
+    def _cache_path(self, path, size):
+        # The file name includes the source mtime, so edits invalidate it.
+        stat = os.stat(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = size if isinstance(size, int) else "x".join(map(str, size))
+        return os.path.join(self.cache_dir,
+                            f"{name}_{spec}_{stat.st_mtime_ns}.rgba")
+
+    def _load(self, path, size):
+        # Decode (and scale) one image without touching the display.
+        if size is None:
+            return pygame.image.load(path)
+        cache_path = self._cache_path(path, size)
+        try:
+            with open(cache_path, "rb") as f:
+                w, h = self.HEADER.unpack(f.read(self.HEADER.size))
+                return pygame.image.frombytes(f.read(), (w, h), "RGBA")
+        except (OSError, ValueError, struct.error):
+            pass
+        image = pygame.image.load(path)
+        if isinstance(size, int):
+            size = fit_size(image.get_size(), size)
+        image = pygame.transform.smoothscale(image, size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path, "wb") as f:
+                f.write(self.HEADER.pack(*size))
+                f.write(pygame.image.tobytes(image, "RGBA"))
+        except OSError:
+            pass  # read-only install: just skip the disk cache
+        return image
+
+    def preload(self, requests):
+        # Start loading [(path, size), ...] on a background thread.
+        # Conversion needs the display, so it still happens on first use.
+        self.wait()
+
+        def work():
+            for path, size in requests:
+                if (path, size) not in self.images:
+                    self.loaded[(path, size)] = self._load(path, size)
+
+        self.thread = threading.Thread(target=work, daemon=True)
+        self.thread.start()
+
+    def wait(self):
+        # Block until the preload thread is done.
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
 
+    def image(self, path, size=None):
+        # Converted surface for (path, size), loaded at most once.
+        key = (path, size)
+        image = self.images.get(key)
+        if image is None:
+            self.wait()
+            image = self.loaded.pop(key, None)
+            if image is None:
+                image = self._load(path, size)
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self.images[key] = image
+        return image
 
-def scale_bullet_image(img_bul):
-    # Scale bullet image proportionally to a small size.
+    def sound(self, path):
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = self.sounds[path] = pygame.mixer.Sound(path)
+        return sound
+
+
+ASSETS = AssetManager()
+
+BULLET_IMAGE = "assets/bullet.png"
+BULLET_SOUND = "assets/bullet.wav"
+
+
+# Bullet Image
+def scale_bullet_image():
+    # Bullet image scaled proportionally to a small size.
     bul_size = 4  # pixels
-    bul_img_w, bul_img_h = img_bul.get_size()
-    bul_scale = (bul_size * 2) / max(bul_img_w, bul_img_h)
-    bul_new_w = max(1, int(bul_img_w * bul_scale))
-    bul_new_h = max(1, int(bul_img_h * bul_scale))
-    bul_new_size = (bul_new_w, bul_new_h)
-    bul_image = pygame.transform.smoothscale(img_bul, bul_new_size)
-    return bul_image
+    return ASSETS.image(BULLET_IMAGE, bul_size * 2)
 
 
 # Movement and Drawing Helpers
@@ -60,71 +156,723 @@ def move_in_direction(x, y, angle, speed, dt,
     return x, y
 
 
+# Rotation Cache
+class RotationCache:
+    # Rotated copies of each image at "steps" quantized angles.
+    # A frame is rendered the first time its angle is drawn (or all of
+    # them up front with prerender) and kept with its rect, so drawing
+    # is a lookup plus a blit instead of a new Surface every frame.
+
+    def __init__(self, steps=360):
+        self.steps = steps
+        self.frames = {}
+
+    def prerender(self, image):
+        # Render every angle of an image now (e.g. at load time).
+        for step in range(self.steps):
+            self.frame(image, step * 360.0 / self.steps)
+
+    def frame(self, image, angle):
+        # Return (rotated surface, rect) for the nearest cached angle.
+        frames = self.frames.get(image)
+        if frames is None:
+            frames = self.frames[image] = [None] * self.steps
+        step = round(angle * self.steps / 360.0) % self.steps
+        entry = frames[step]
+        if entry is None:
+            angle = step * 360.0 / self.steps
+            rotated = pygame.transform.rotate(image, -angle)
+            entry = frames[step] = (rotated, rotated.get_rect())
+        return entry
+
+    def clear(self):
+        self.frames.clear()
+
+
+ROTATIONS = RotationCache()
+
+
 def draw_rotated_image(screen, image, angle, x, y):
-    # Rotate an image around its center and draw it.
-    rotated = pygame.transform.rotate(image, -angle)
-    rect = rotated.get_rect(center=(x, y))
-    screen.blit(rotated, rect.topleft)
+    # Draw an image rotated around its center, using the rotation cache.
+    rotated, rect = ROTATIONS.frame(image, angle)
+    rect.center = (x, y)
+    screen.blit(rotated, rect)
     return rect
 
 
+def interpolate(previous, current, alpha, period=None):
+    # Position between two simulation steps (alpha in 0..1).
+    # With a period (screen size), a jump across a wrapped border
+    # is not interpolated.
+    delta = current - previous
+    if period is not None and abs(delta) > period / 2:
+        return current
+    return previous + delta * alpha
+
+
+@lru_cache(maxsize=128)
+def render_text(font, text, color):
+    # Render a text once and reuse it until the value changes.
+    return font.render(text, True, color)
+
+
 def render_score(screen, font, pos1, pos2, score1, score2, color1, color2):
     # Render two player scores on the screen.
-    text1 = font.render(str(score1), True, color1)
-    text2 = font.render(str(score2), True, color2)
-    screen.blit(text1, pos1)
-    screen.blit(text2, pos2)
-
-
-# Bullet Class
-class Bullet:
-    # Represents a bullet fired by a player.
-
-    def __init__(self, x, y, angle, image, max_distance_pixels):
-        bul_speed = 900.0
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.image = image
-        self.original_image = image
-        self.rad = math.radians(self.angle - 270)
-        self.vel_x = math.sin(self.rad) * bul_speed
-        self.vel_y = -math.cos(self.rad) * bul_speed
-        self.rect = self.image.get_rect(center=(self.x, self.y))
-        self.max_distance_pixels = max_distance_pixels
-        self.traveled_distance = 0.0
-        self.last_x = x
-        self.last_y = y
-
-    def update(self, dt, width, height):
-        # Update bullet position and return False if it exceeded max distance.
-        self.last_x = self.x
-        self.last_y = self.y
-
-        self.x += self.vel_x * dt
-        self.y += self.vel_y * dt
-
-        delta_x = self.x - self.last_x
-        delta_y = self.y - self.last_y
-        self.traveled_distance += math.hypot(delta_x, delta_y)
-
-        # Wrap-around
-        if self.x < 0:
-            self.x += width
-        elif self.x > width:
-            self.x -= width
-        if self.y < 0:
-            self.y += height
-        elif self.y > height:
-            self.y -= height
-
-        self.rect.center = (self.x, self.y)
-        return self.traveled_distance < self.max_distance_pixels
+    # Returns the two rects drawn.
+    text1 = render_text(font, str(score1), color1)
+    text2 = render_text(font, str(score2), color2)
+    return screen.blit(text1, pos1), screen.blit(text2, pos2)
+
+
+# Background Compositor
+def merge_rects(rects):
+    # Union overlapping rects until no two of the results overlap, so
+    # a few larger rects are blitted instead of many fragments.
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        hit = rect.collidelist(merged)
+        while hit != -1:
+            rect.union_ip(merged.pop(hit))
+            hit = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Compositor:
+    # The static background (fill color and static images) is baked
+    # once into a display-format surface, and alpha foreground layers
+    # (e.g. clouds over the planes) are kept as RLE surfaces.
+    # The game draws on "scene" (background plus sprites, no layers).
+    # Each frame restore() puts the background back in the scene only
+    # under what was drawn last frame, the game draws and marks its
+    # rects, and finish() copies those rects to the screen with the
+    # foreground on top and returns them for pygame.display.update.
+
+    def __init__(self, size, fill=(0, 0, 0), static=()):
+        background = pygame.Surface(size)
+        background.fill(fill)
+        for image, pos in static:
+            background.blit(image, pos)
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        self.background = background
+        self.scene = background.copy()
+        self.layers = []
+        self.prev = []
+        self.current = []
+        self.full = True
+
+    def add_layer(self, image, pos):
+        # Foreground image drawn over everything at a fixed position.
+        layer = image.copy()
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert_alpha()
+        layer.set_alpha(255, pygame.RLEACCEL)
+        rect = layer.get_rect(topleft=pos)
+        self.layers.append((layer, rect))
+        return rect
+
+    def invalidate(self):
+        # Redraw (and update) the whole screen next frame.
+        self.full = True
+
+    def restore(self):
+        if self.full:
+            self.scene.blit(self.background, (0, 0))
+            return
+        self.scene.blits([(self.background, rect, rect)
+                          for rect in self.prev], doreturn=False)
+
+    def mark(self, rect):
+        # Something was drawn in rect this frame.
+        if rect:
+            self.current.append(pygame.Rect(rect))
+
+    def blit(self, image, pos):
+        rect = self.scene.blit(image, pos)
+        self.current.append(rect)
+        return rect
+
+    def finish(self, screen):
+        if self.full:
+            dirty = [screen.blit(self.scene, (0, 0))]
+            self.full = False
+        else:
+            # Merged rects never overlap, so no pixel gets a layer
+            # blended twice
+            dirty = merge_rects(self.prev + self.current)
+            screen.blits([(self.scene, rect, rect) for rect in dirty],
+                         doreturn=False)
+        for layer, rect in self.layers:
+            for area in rect.collidelistall(dirty):
+                clip = rect.clip(dirty[area])
+                screen.blit(layer, clip, clip.move(-rect.x, -rect.y))
+        self.prev = self.current
+        self.current = []
+        return dirty
+
+
+# Frame Profiler
+class FrameProfiler:
+    # Times the phases of each frame and keeps rolling statistics.
+    # Call begin() at the top of the frame, lap(phase) after every
+    # phase and end() when the frame is done.
+
+    PHASES = ("input", "update", "collision", "draw", "flip")
+
+    def __init__(self, window=600):
+        self.frames = deque(maxlen=window)
+        self.samples = {p: deque(maxlen=window) for p in self.PHASES}
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+        self.t0 = self.mark = time.perf_counter()
+        self.overlay = False
+        self.font = None
+
+    def begin(self):
+        self.t0 = self.mark = time.perf_counter()
+        for p in self.PHASES:
+            self.current[p] = 0.0
+
+    def lap(self, phase):
+        # Charge the time since the previous mark to the phase.
+        now = time.perf_counter()
+        self.current[phase] += (now - self.mark) * 1000.0
+        self.mark = now
+
+    def end(self):
+        self.frames.append((time.perf_counter() - self.t0) * 1000.0)
+        for p in self.PHASES:
+            self.samples[p].append(self.current[p])
+
+    @staticmethod
+    def percentile(values, q):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def stats(self):
+        # p50/p95/p99 frame time (ms) and mean ms of every phase.
+        return {
+            "frames": len(self.frames),
+            "p50": self.percentile(self.frames, 50),
+            "p95": self.percentile(self.frames, 95),
+            "p99": self.percentile(self.frames, 99),
+            "max": max(self.frames, default=0.0),
+            "phases": {
+                p: sum(s) / len(s) if s else 0.0
+                for p, s in self.samples.items()
+            },
+        }
+
+    def export(self, csv_path="profile.csv", json_path="profile.json"):
+        # Write one CSV row per frame and a JSON summary.
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame_ms",) + self.PHASES)
+            columns = [self.frames] + [self.samples[p] for p in self.PHASES]
+            for row in zip(*columns):
+                writer.writerow(f"{v:.4f}" for v in row)
+        with open(json_path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def handle_key(self, key):
+        # F3 shows/hides the overlay, F4 exports the numbers.
+        if key == pygame.K_F3:
+            self.overlay = not self.overlay
+        elif key == pygame.K_F4:
+            self.export()
 
     def draw(self, screen):
-        # Draw bullet image.
-        screen.blit(self.image, self.rect.topleft)
+        # Draw the statistics in the bottom-left corner.
+        # Returns the rects drawn.
+        if not self.overlay:
+            return []
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        s = self.stats()
+        lines = [f"p50 {s['p50']:.1f}  p95 {s['p95']:.1f}  "
+                 f"p99 {s['p99']:.1f} ms"]
+        lines += [f"{p} {ms:.2f} ms" for p, ms in s["phases"].items()]
+        line = self.font.get_linesize()
+        y = screen.get_height() - 10 - line * len(lines)
+        rects = []
+        for text in lines:
+            surf = self.font.render(text, True, (255, 255, 255), (0, 0, 0))
+            rects.append(screen.blit(surf, (10, y)))
+            y += line
+        return rects
+
+
+# Swept Collision Tests
+# A fast bullet can jump over a target between two frames, so these
+# test the whole segment it travelled (x0, y0) -> (x1, y1). They work
+# on floats or NumPy arrays (one segment per element).
+def segment_hits_box(x0, y0, x1, y1, left, top, right, bottom):
+    # Segment vs axis-aligned box given as edges (Liang-Barsky
+    # clipping); all arguments broadcast,
+    # e.g. (N, 1) segments against (1, M) boxes give an (N, M) mask.
+    x0, y0 = np.asarray(x0, dtype=float), np.asarray(y0, dtype=float)
+    dx, dy = x1 - x0, y1 - y0
+    shape = np.broadcast_shapes(np.shape(dx), np.shape(dy), np.shape(left),
+                                np.shape(top), np.shape(right),
+                                np.shape(bottom))
+    t0 = np.zeros(shape)
+    t1 = np.ones(shape)
+    ok = np.ones(shape, dtype=bool)
+    for p, q in ((-dx, x0 - left), (dx, right - x0),
+                 (-dy, y0 - top), (dy, bottom - y0)):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        ok &= ~((p == 0) & (q < 0))  # parallel and outside this slab
+        t0 = np.where(p < 0, np.maximum(t0, r), t0)
+        t1 = np.where(p > 0, np.minimum(t1, r), t1)
+    return ok & (t0 <= t1)
+
+
+def segment_hits_circle(x0, y0, x1, y1, cx, cy, radius):
+    # Segment vs circle: closest point of the segment to the center.
+    x0, y0 = np.asarray(x0, dtype=float), np.asarray(y0, dtype=float)
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = ((cx - x0) * dx + (cy - y0) * dy) / length2
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    ex = x0 + t * dx - cx
+    ey = y0 + t * dy - cy
+    return ex * ex + ey * ey <= radius * radius
+
+
+# Fixed Timestep Loop
+class GameLoop:
+    # Runs the simulation at a fixed step, independent of the frame rate.
+    # Real time goes into an accumulator and update(step) runs once per
+    # whole step in it; draw(alpha) then gets the leftover fraction of a
+    # step to interpolate positions. After a slow frame at most
+    # max_steps updates run and the rest of the time is dropped (frame
+    # skip), so the game slows down instead of spiralling.
+    # render_fps=0 renders uncapped (e.g. 60 Hz sim on a 144 Hz display).
+    # With a Compositor, draw() renders on compositor.scene and only the
+    # rects it collects are sent to the display instead of flipping the
+    # whole screen.
+
+    def __init__(self, clock, step=1 / 60, max_steps=5, render_fps=60,
+                 profiler=None, compositor=None):
+        self.clock = clock
+        self.step = step
+        self.max_steps = max_steps
+        self.render_fps = render_fps
+        self.profiler = profiler
+        self.compositor = compositor
+        self.accumulator = 0.0
+        self.running = False
+
+    def stop(self):
+        self.running = False
+
+    def run(self, handle_event, update, draw):
+        # handle_event(event) for every event but QUIT, update(dt) per
+        # simulation step and draw(alpha) once per rendered frame.
+        profiler = self.profiler
+        compositor = self.compositor
+        screen = pygame.display.get_surface()
+        self.running = True
+        while self.running:
+            frame_time = self.clock.tick(self.render_fps) / 1000.0
+            if profiler:
+                profiler.begin()
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                else:
+                    handle_event(event)
+            if profiler:
+                profiler.lap("input")
+
+            self.accumulator += frame_time
+            steps = 0
+            while self.accumulator >= self.step and steps < self.max_steps:
+                update(self.step)
+                self.accumulator -= self.step
+                steps += 1
+            if steps == self.max_steps:
+                # Too far behind: skip the time we could not simulate
+                self.accumulator = min(self.accumulator, self.step)
+
+            if compositor:
+                compositor.restore()
+            draw(self.accumulator / self.step)
+            canvas = compositor.scene if compositor else screen
+            overlay = profiler.draw(canvas) if profiler else []
+            if compositor:
+                for rect in overlay:
+                    compositor.mark(rect)
+                dirty = compositor.finish(screen)
+            if profiler:
+                profiler.lap("draw")
+            if compositor:
+                pygame.display.update(dirty)
+            else:
+                pygame.display.flip()
+            if profiler:
+                profiler.lap("flip")
+                profiler.end()
+
+
+# Static Obstacle Index
+class ObstacleIndex:
+    # Collision structure built once from the arena's static rects.
+    # A uniform grid lists the obstacles touching each cell, so rect
+    # queries only look at nearby walls. For bullets, a pixel bitmap is
+    # grown by the bullet size, so "does a bw x bh rect at (left, top)
+    # touch a wall" is a single lookup, whatever the number of walls.
+
+    def __init__(self, rects, width, height, cell=64, margin=32):
+        self.rects = [pygame.Rect(r) for r in rects]
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.margin = margin
+        self.cols = width // cell + 1
+        self.rows = height // cell + 1
+        self.cells = {}
+        for i, rect in enumerate(self.rects):
+            for key in self._keys(rect):
+                self.cells.setdefault(key, []).append(i)
+        self.bitmaps = {}
+
+    def _keys(self, rect):
+        # Cells touched by rect; anything off the arena goes to the border.
+        c = self.cell
+        cols, rows = self.cols - 1, self.rows - 1
+        x0 = min(cols, max(0, rect.left // c))
+        x1 = min(cols, max(0, (rect.right - 1) // c))
+        y0 = min(rows, max(0, rect.top // c))
+        y1 = min(rows, max(0, (rect.bottom - 1) // c))
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def near(self, rect):
+        # Obstacles sharing a grid cell with rect, in their original order.
+        found = set()
+        for key in self._keys(rect):
+            found.update(self.cells.get(key, ()))
+        return [self.rects[i] for i in sorted(found)]
+
+    def collides(self, rect):
+        return any(rect.colliderect(ob) for ob in self.near(rect))
+
+    def bitmap(self, bw, bh):
+        # Bitmap indexed [top + margin, left + margin]: True where a
+        # bw x bh rect with that top-left corner touches a wall.
+        key = (bw, bh)
+        bitmap = self.bitmaps.get(key)
+        if bitmap is None:
+            m = self.margin
+            bitmap = np.zeros((self.height + 2 * m, self.width + 2 * m),
+                              dtype=bool)
+            for ob in self.rects:
+                x0 = max(0, ob.left - bw + 1 + m)
+                y0 = max(0, ob.top - bh + 1 + m)
+                bitmap[y0:ob.bottom + m, x0:ob.right + m] = True
+            bitmap = self.bitmaps[key] = bitmap
+        return bitmap
+
+    def rects_hit(self, left, top, bw, bh):
+        # Vectorized: mask of the bw x bh rects (int arrays of top-left
+        # corners) that touch a wall. Corners off the bitmap never hit.
+        bitmap = self.bitmap(bw, bh)
+        m = self.margin
+        col = left + m
+        row = top + m
+        inside = ((col >= 0) & (col < bitmap.shape[1])
+                  & (row >= 0) & (row < bitmap.shape[0]))
+        hit = np.zeros(len(left), dtype=bool)
+        hit[inside] = bitmap[row[inside], col[inside]]
+        return hit
+
+    def swept_rects_hit(self, left0, top0, left1, top1, bw, bh):
+        # Like rects_hit, along the path from (left0, top0) to
+        # (left1, top1): sampled no further apart than the rect size,
+        # so consecutive samples overlap and no wall can be skipped.
+        dx = left1 - left0
+        dy = top1 - top0
+        steps = int(np.max(np.ceil(np.maximum(np.abs(dx) / bw,
+                                              np.abs(dy) / bh)),
+                           initial=0))
+        hit = self.rects_hit(left1, top1, bw, bh)
+        for k in range(steps):
+            f = k / steps
+            hit |= self.rects_hit((left0 + dx * f).astype(int),
+                                  (top0 + dy * f).astype(int), bw, bh)
+        return hit
+
+
+# Navigation Grid
+class NavGrid:
+    # Walkable cells of the arena, built once from the static rects.
+    # A cell is blocked when a square of half-size "clearance" around
+    # its center touches a wall, so a path through free cells keeps the
+    # whole agent off the walls. Line-of-sight between two cells is
+    # memoized per cell pair: the walls never move.
+
+    def __init__(self, rects, width, height, cell=24, clearance=24):
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        self.blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        index = ObstacleIndex(rects, width, height)
+        size = 2 * clearance
+        for row in range(self.rows):
+            for col in range(self.cols):
+                x, y = self.center((col, row))
+                box = pygame.Rect(int(x - clearance), int(y - clearance),
+                                  size, size)
+                self.blocked[row, col] = index.collides(box)
+        self.sight = {}
+
+    def cell_of(self, x, y):
+        col = min(self.cols - 1, max(0, int(x // self.cell)))
+        row = min(self.rows - 1, max(0, int(y // self.cell)))
+        return col, row
+
+    def center(self, cell):
+        return ((cell[0] + 0.5) * self.cell, (cell[1] + 0.5) * self.cell)
+
+    def free(self, cell):
+        return not self.blocked[cell[1], cell[0]]
+
+    def nearest_free(self, cell):
+        # Closest free cell, searching rings around a blocked one.
+        if self.free(cell):
+            return cell
+        col, row = cell
+        for r in range(1, max(self.cols, self.rows)):
+            ring = [(col + dx, row + dy)
+                    for dx in range(-r, r + 1) for dy in (-r, r)]
+            ring += [(col + dx, row + dy)
+                     for dx in (-r, r) for dy in range(-r + 1, r)]
+            ring = [c for c in ring
+                    if 0 <= c[0] < self.cols and 0 <= c[1] < self.rows
+                    and self.free(c)]
+            if ring:
+                return min(ring, key=lambda c: (c[0] - col) ** 2
+                           + (c[1] - row) ** 2)
+        return cell
+
+    def line_of_sight(self, a, b):
+        # True when the segment between the centers of cells a and b
+        # only crosses free cells (sampled every quarter cell).
+        key = (a, b) if a <= b else (b, a)
+        seen = self.sight.get(key)
+        if seen is None:
+            n = int(max(abs(b[0] - a[0]), abs(b[1] - a[1])) * 4) + 1
+            t = np.linspace(0.0, 1.0, n + 1)
+            cols = np.rint(a[0] + (b[0] - a[0]) * t).astype(int)
+            rows = np.rint(a[1] + (b[1] - a[1]) * t).astype(int)
+            seen = self.sight[key] = not self.blocked[rows, cols].any()
+        return seen
+
+    def neighbors(self, cell):
+        # 8-connected free neighbours with their step cost; diagonals
+        # may not cut the corner of a blocked cell.
+        col, row = cell
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if not (dx or dy):
+                    continue
+                c, r = col + dx, row + dy
+                if not (0 <= c < self.cols and 0 <= r < self.rows):
+                    continue
+                if self.blocked[r, c]:
+                    continue
+                if dx and dy and (self.blocked[row, c]
+                                  or self.blocked[r, col]):
+                    continue
+                yield (c, r), (1.4142 if dx and dy else 1.0)
+
+    def search(self, start, goal, chunk=64):
+        # A* from start to goal (octile distance), written as a
+        # generator: it yields after every chunk expansions so a caller
+        # can spread one search over several frames. The generator's
+        # return value is the smoothed list of waypoint cells (start
+        # excluded), or None when goal cannot be reached.
+        def h(cell):
+            dx = abs(cell[0] - goal[0])
+            dy = abs(cell[1] - goal[1])
+            return max(dx, dy) + 0.4142 * min(dx, dy)
+
+        g = {start: 0.0}
+        came_from = {start: None}
+        heap = [(h(start), 0, start)]
+        counter = 1
+        expanded = 0
+        closed = set()
+        while heap:
+            _, _, cell = heapq.heappop(heap)
+            if cell in closed:
+                continue
+            if cell == goal:
+                return self.smooth(self.walk_back(came_from, goal))
+            closed.add(cell)
+            for nxt, cost in self.neighbors(cell):
+                score = g[cell] + cost
+                if score < g.get(nxt, float("inf")):
+                    g[nxt] = score
+                    came_from[nxt] = cell
+                    heapq.heappush(heap, (score + h(nxt), counter, nxt))
+                    counter += 1
+            expanded += 1
+            if expanded % chunk == 0:
+                yield
+        return None
+
+    @staticmethod
+    def walk_back(came_from, goal):
+        path = [goal]
+        while came_from[path[-1]] is not None:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return path
+
+    def smooth(self, path):
+        # Keep only the cells where the path has to turn: from each
+        # waypoint jump to the furthest cell still in line of sight.
+        waypoints = []
+        i = 0
+        while i < len(path) - 1:
+            j = len(path) - 1
+            while j > i + 1 and not self.line_of_sight(path[i], path[j]):
+                j -= 1
+            waypoints.append(path[j])
+            i = j
+        return waypoints
+
+
+# Path Planner
+class PathPlanner:
+    # Shared route cache for any number of agents on one NavGrid.
+    # path() answers at once from the cache: a visible goal needs no
+    # search, and when the goal moved to a cell visible from the end of
+    # the cached route only that last leg is replaced. Otherwise an A*
+    # search is queued, and run() advances the queued searches round
+    # robin for at most "budget" node expansions per call, so many
+    # agents never stall a frame (they keep their old route meanwhile).
+
+    def __init__(self, grid, budget=600, chunk=64):
+        self.grid = grid
+        self.budget = budget
+        self.chunk = chunk
+        self.routes = {}    # agent -> (goal cell, waypoint cells)
+        self.searches = {}  # agent -> (goal cell, A* generator), a queue
+
+    def path(self, agent, start, goal):
+        # Waypoint cells from the cell of point start toward point goal.
+        grid = self.grid
+        start = grid.nearest_free(grid.cell_of(*start))
+        goal = grid.nearest_free(grid.cell_of(*goal))
+        route = self.routes.get(agent)
+        if route is not None and route[0] == goal:
+            return route[1]
+        if grid.line_of_sight(start, goal):
+            self.searches.pop(agent, None)
+            return self._keep(agent, goal, [goal])
+        if route is not None and route[1]:
+            # Incremental repair: re-aim the last leg of the route
+            tail = route[1][-2] if len(route[1]) > 1 else start
+            if grid.line_of_sight(tail, goal):
+                return self._keep(agent, goal, route[1][:-1] + [goal])
+        search = self.searches.get(agent)
+        if search is None or search[0] != goal:
+            self.searches[agent] = (goal, grid.search(start, goal,
+                                                      self.chunk))
+        return route[1] if route is not None else []
+
+    def _keep(self, agent, goal, waypoints):
+        self.routes[agent] = (goal, waypoints)
+        return waypoints
+
+    def forget(self, agent):
+        self.routes.pop(agent, None)
+        self.searches.pop(agent, None)
+
+    def run(self):
+        # Spend at most budget expansions on the queued searches.
+        spent = 0
+        while self.searches and spent < self.budget:
+            agent = next(iter(self.searches))
+            goal, search = self.searches.pop(agent)
+            try:
+                next(search)
+            except StopIteration as done:
+                if done.value is not None:
+                    self._keep(agent, goal, done.value)
+            else:
+                self.searches[agent] = (goal, search)  # back of the queue
+            spent += self.chunk
+
+
+# Projectile Array
+class ProjectileArray:
+    # Bullets stored as NumPy columns (x, y, vx, vy, life, owner) so
+    # movement and hit tests run as vectorized masks over all of them.
+    # Only the first n rows are alive; removal moves the last rows into
+    # the holes (swap-remove), so the live rows stay packed.
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.n = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        # Position before the last step, for swept hit tests
+        self.last_x = np.zeros(capacity)
+        self.last_y = np.zeros(capacity)
+        self.columns = (self.x, self.y, self.vx, self.vy,
+                        self.life, self.owner, self.last_x, self.last_y)
+
+    def __len__(self):
+        return self.n
+
+    def spawn(self, x, y, vx, vy, owner, life):
+        # Add one projectile; return its row, or None if full.
+        i = self.n
+        if i >= self.capacity:
+            return None
+        values = (x, y, vx, vy, life, owner, x, y)
+        for column, value in zip(self.columns, values):
+            column[i] = value
+        self.n = i + 1
+        return i
+
+    def step(self, dt):
+        # Move every live projectile and age it.
+        n = self.n
+        self.last_x[:n] = self.x[:n]
+        self.last_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.life[:n] -= dt
+
+    def remove(self, dead):
+        # Drop the rows where the boolean mask "dead" (length n) is set.
+        # The holes below the new end are filled with the live rows
+        # from the tail, so only the moved rows are copied.
+        n = self.n
+        keep = n - int(np.count_nonzero(dead))
+        if keep == n:
+            return
+        holes = np.flatnonzero(dead[:keep])
+        movers = keep + np.flatnonzero(~dead[keep:n])
+        for column in self.columns:
+            column[holes] = column[movers]
+        self.n = keep
 
-    def get_rect(self):
-        # Return bullet rectangle for collision detection.
-        return self.rect
+    def clear(self):
+        self.n = 0
@@ -0,0 +1,117 @@
+import math
+import random
+import pygame
+
+
+# Alpha Ramps
+def alpha_ramp(peak, steps):
+    # Entry i is the overlay alpha at level i (peak * i / steps).
+    return [round(peak * i / steps) for i in range(steps + 1)]
+
+
+# Screen Effects
+class ScreenEffects:
+    # Hit flash, screen shake and fade transitions drawn over a finished
+    # frame. Flash and fade blit one solid, display-format overlay per
+    # color with its surface alpha taken from a ramp computed once per
+    # peak. Overlays for "colors" and the shake buffer are allocated up
+    # front, so triggering or drawing an effect allocates no surfaces.
+    # Call update(dt) once per simulation step and draw(screen) after
+    # the game has drawn its frame.
+
+    def __init__(self, size, border=(0, 0, 0), steps=32,
+                 colors=((255, 255, 255), (0, 0, 0))):
+        self.size = size
+        self.steps = steps
+        self.border = border
+        self.ramps = {}
+        self.overlays = {}
+        for color in colors:
+            self.overlay(color)
+        # Copy of the frame, blitted back shifted while shaking
+        self.frame = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            self.frame = self.frame.convert()
+        self.rng = random.Random()
+        self.flash_overlay = self.flash_ramp = None
+        self.flash_time = self.flash_duration = 0.0
+        self.shake_amplitude = 0.0
+        self.shake_time = self.shake_duration = 0.0
+        self.fade_overlay = self.fade_ramp = None
+        self.fade_out = False
+        self.fade_time = self.fade_duration = 0.0
+
+    def ramp(self, peak=255):
+        if peak not in self.ramps:
+            self.ramps[peak] = alpha_ramp(peak, self.steps)
+        return self.ramps[peak]
+
+    def overlay(self, color):
+        # Full-screen surface filled with color (made once per color).
+        color = tuple(color)
+        overlay = self.overlays.get(color)
+        if overlay is None:
+            overlay = pygame.Surface(self.size)
+            if pygame.display.get_surface() is not None:
+                overlay = overlay.convert()
+            overlay.fill(color)
+            self.overlays[color] = overlay
+        return overlay
+
+    def level(self, remaining, duration):
+        # Ramp index for the time left in an effect (steps at start).
+        return min(self.steps, math.ceil(remaining / duration * self.steps))
+
+    def flash(self, color=(255, 255, 255), peak=140, duration=0.18):
+        # Tint the screen toward color, fading out over duration.
+        self.flash_overlay = self.overlay(color)
+        self.flash_ramp = self.ramp(peak)
+        self.flash_time = self.flash_duration = duration
+
+    def shake(self, amplitude=6, duration=0.25):
+        # Jitter the whole frame by up to amplitude pixels, decaying.
+        self.shake_amplitude = amplitude
+        self.shake_time = self.shake_duration = duration
+
+    def fade(self, color=(0, 0, 0), duration=0.5, out=False):
+        # Fade in from color, or out to it (the screen stays covered
+        # once a fade out ends, until clear() or another fade).
+        self.fade_overlay = self.overlay(color)
+        self.fade_ramp = self.ramp()
+        self.fade_out = out
+        self.fade_time = self.fade_duration = duration
+
+    def clear(self):
+        self.flash_time = self.shake_time = self.fade_time = 0.0
+        self.fade_out = False
+
+    def active(self):
+        return (self.flash_time > 0 or self.shake_time > 0
+                or self.fade_time > 0 or self.fade_out)
+
+    def update(self, dt):
+        self.flash_time = max(0.0, self.flash_time - dt)
+        self.shake_time = max(0.0, self.shake_time - dt)
+        self.fade_time = max(0.0, self.fade_time - dt)
+
+    def draw(self, screen):
+        if self.shake_time > 0:
+            reach = round(self.shake_amplitude * self.shake_time
+                          / self.shake_duration)
+            offset = (self.rng.randint(-reach, reach),
+                      self.rng.randint(-reach, reach))
+            self.frame.blit(screen, (0, 0))
+            screen.fill(self.border)
+            screen.blit(self.frame, offset)
+
+        if self.flash_time > 0:
+            self.flash_overlay.set_alpha(self.flash_ramp[
+                self.level(self.flash_time, self.flash_duration)])
+            screen.blit(self.flash_overlay, (0, 0))
+
+        if self.fade_time > 0 or self.fade_out:
+            level = self.level(self.fade_time, self.fade_duration)
+            if self.fade_out:
+                level = self.steps - level
+            self.fade_overlay.set_alpha(self.fade_ramp[level])
+            screen.blit(self.fade_overlay, (0, 0))
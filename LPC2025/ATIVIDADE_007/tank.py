@@ -1,6 +1,8 @@
 import math
+import numpy as np
 import pygame
 import core
+import effects
 
 SCREEN_WIDTH = 900
 SCREEN_HEIGHT = 600
@@ -19,6 +21,14 @@ BULLET_COOLDOWN = 0.35
 SPIN_SPEED = 800
 SPIN_DURATION = 1.0
 
+# CPU tanks: player 2 can be a bot (single player) and AI_TANKS extra
+# bots join the match (bot fill, 0 = classic two players)
+CPU_PLAYER_2 = False
+AI_TANKS = 0
+AI_PLAN_BUDGET = 600  # A* node expansions per simulation step, all bots
+AI_HOLD_DISTANCE = 160  # bots stop closing in once this near
+AI_AIM_TOLERANCE = 5  # degrees off target a bot still fires at
+
 # Colors
 BG_COLOR = (24, 24, 36)
 WHITE = (255, 255, 255)
@@ -27,19 +37,26 @@ P2_COLOR = (250, 0, 0)
 OBST_COLOR = (100, 100, 120)
 FLASH_COLOR = (255, 200, 50)
 
+TANK_IMAGE_P1 = "assets/tank_p1.png"
+TANK_IMAGE_P2 = "assets/tank_p2.png"
+
 # Initialization
 pygame.init()
 pygame.mixer.init()
+# Decode and scale the images while the window and mixer start
+core.ASSETS.preload([
+    (TANK_IMAGE_P1, (TANK_SIZE, TANK_SIZE)),
+    (TANK_IMAGE_P2, (TANK_SIZE, TANK_SIZE)),
+    (core.BULLET_IMAGE, 8),
+])
 screen, clock, WIDTH, HEIGHT = core.screen_setup("Combat")
 
 # Load tank and bullet images + sound
-img_t1, img_t2, img_bullet, bullet_sound = core.load_image(
-    "assets/tank_p1.png", "assets/tank_p2.png"
-)
-bullet_image = core.scale_bullet_image(img_bullet)
+bullet_sound = core.ASSETS.sound(core.BULLET_SOUND)
+bullet_image = core.scale_bullet_image()
 
-tank_img_p1 = pygame.transform.smoothscale(img_t1, (TANK_SIZE, TANK_SIZE))
-tank_img_p2 = pygame.transform.smoothscale(img_t2, (TANK_SIZE, TANK_SIZE))
+tank_img_p1 = core.ASSETS.image(TANK_IMAGE_P1, (TANK_SIZE, TANK_SIZE))
+tank_img_p2 = core.ASSETS.image(TANK_IMAGE_P2, (TANK_SIZE, TANK_SIZE))
 
 # Scoreboard setup (same style as warplane)
 score_font, score1_pos, score2_pos = core.scoreboard_setup(WIDTH)
@@ -53,45 +70,19 @@ OBSTACLES = [
     pygame.Rect(WIDTH // 2 - 260, HEIGHT // 2 + 160, 120, 30),
     pygame.Rect(WIDTH // 2 + 140, HEIGHT // 2 + 160, 120, 30),
 ]
-
-
-class Bullet:
-    def __init__(
-        self,
-        x: float,
-        y: float,
-        vx: float,
-        vy: float,
-        owner: int,
-        life: float,
-    ):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.owner = owner
-        self.life = life
-
-    def rect(self) -> pygame.Rect:
-        return pygame.Rect(
-            int(self.x - bullet_image.get_width() / 2),
-            int(self.y - bullet_image.get_height() / 2),
-            bullet_image.get_width(),
-            bullet_image.get_height(),
-        )
-
-    def draw(self, surface):
-        surface.blit(
-            bullet_image,
-            (self.x - bullet_image.get_width() / 2,
-             self.y - bullet_image.get_height() / 2),
-        )
+# Built once: grid for tank push-out, bitmap for bullet hits
+OBSTACLE_INDEX = core.ObstacleIndex(OBSTACLES, WIDTH, HEIGHT)
+# Built once: walkable cells for CPU tanks (half a tank plus half a
+# cell away from the walls)
+NAV_GRID = core.NavGrid(OBSTACLES, WIDTH, HEIGHT, cell=24,
+                        clearance=TANK_SIZE // 2 + 12)
 
 
 class Tank:
     # Tank object with rotation, shooting, and collision.
 
-    def __init__(self, x, y, angle_deg, color, controls, name="Tank"):
+    def __init__(self, x, y, angle_deg, color, controls, name="Tank",
+                 owner_id=1):
         self.x = float(x)
         self.y = float(y)
         self.prev_x = float(x)
@@ -100,6 +91,7 @@ class Tank:
         self.color = color
         self.controls = controls
         self.name = name
+        self.owner_id = owner_id  # marks this tank's bullets
         self.cooldown = 0.0
         self.score = 0
         self.spinning = False
@@ -148,8 +140,8 @@ class Tank:
             TANK_SIZE,
         )
 
-    def shoot(self):
-        # Fire a bullet if possible.
+    def shoot(self, projectiles: core.ProjectileArray):
+        # Fire a bullet into the projectile array if possible.
         if self.spinning or self.cooldown > 0:
             return None
 
@@ -161,10 +153,13 @@ class Tank:
         vx = dir_x * BULLET_SPEED
         vy = dir_y * BULLET_SPEED
 
+        row = projectiles.spawn(bx, by, vx, vy, self.owner_id,
+                                BULLET_LIFETIME)
+        if row is None:
+            return None
         self.cooldown = BULLET_COOLDOWN
-        owner_id = 1 if self.color == P1_COLOR else 2
         bullet_sound.play()  # Fire sound
-        return Bullet(bx, by, vx, vy, owner_id, BULLET_LIFETIME)
+        return row
 
     def hit(self):
         # Trigger spin animation when hit.
@@ -172,23 +167,80 @@ class Tank:
         self.spin_timer = SPIN_DURATION
 
 
-def draw_tank(surface, tank: Tank):
-    # Draw tank rotated according to its angle.
+def draw_tank(surface, tank: Tank, alpha=1.0):
+    # Draw tank rotated according to its angle,
+    # interpolated between the last two simulation steps.
     image = tank_img_p1 if tank.color == P1_COLOR else tank_img_p2
-    core.draw_rotated_image(surface, image, tank.angle, tank.x, tank.y)
-
-
-def bullet_hits_obstacle(bullet: Bullet) -> bool:
-    # Check if a bullet hits any obstacle.
-    rect = bullet.rect()
-    return any(rect.colliderect(ob) for ob in OBSTACLES)
-
-
-def resolve_collisions(t1: Tank, t2: Tank):
+    x = core.interpolate(tank.prev_x, tank.x, alpha)
+    y = core.interpolate(tank.prev_y, tank.y, alpha)
+    core.draw_rotated_image(surface, image, tank.angle, x, y)
+
+
+def bullets_in_obstacles(last_x, last_y, x, y):
+    # Mask of the bullets whose rect touched an obstacle this frame.
+    bw, bh = bullet_image.get_size()
+    return OBSTACLE_INDEX.swept_rects_hit(
+        (last_x - bw / 2).astype(int), (last_y - bh / 2).astype(int),
+        (x - bw / 2).astype(int), (y - bh / 2).astype(int), bw, bh)
+
+
+def bullets_in_tank(last_x, last_y, x, y, owner, tank: Tank):
+    # Mask of the other tanks' bullets whose path crossed the tank.
+    # The hull turns but its rect does not, so it is tested as a
+    # circle, grown by the bullet radius.
+    hit = core.segment_hits_circle(last_x, last_y, x, y, tank.x, tank.y,
+                                   TANK_SIZE / 2 + BULLET_RADIUS)
+    return (owner != tank.owner_id) & hit
+
+
+def update_bullets(dt):
+    # Move every bullet and remove the ones that hit something,
+    # left the screen or ran out of life. Returns True on a tank hit.
+    bullets.step(dt)
+    n = len(bullets)
+    x, y = bullets.x[:n], bullets.y[:n]
+    last_x, last_y = bullets.last_x[:n], bullets.last_y[:n]
+    life, owner = bullets.life[:n], bullets.owner[:n]
+
+    dead = bullets_in_obstacles(last_x, last_y, x, y)
+    dead |= (x < -10) | (x > WIDTH + 10) | (y < -10) | (y > HEIGHT + 10)
+    dead |= life <= 0
+
+    scored = False
+    for target in tanks:
+        if target.spinning:
+            continue
+        hits = np.flatnonzero(
+            ~dead & bullets_in_tank(last_x, last_y, x, y, owner, target))
+        if len(hits):
+            # One hit per tank: it spins (and is immune) right after
+            target.hit()
+            tanks[int(owner[hits[-1]]) - 1].score += 1
+            dead[hits[-1]] = True
+            scored = True
+
+    bullets.remove(dead)
+    return scored
+
+
+def draw_bullets(surface, alpha=1.0):
+    # Draw every bullet with a single blits call,
+    # interpolated between the last two simulation steps.
+    n = len(bullets)
+    bw, bh = bullet_image.get_size()
+    x = bullets.last_x[:n] + (bullets.x[:n] - bullets.last_x[:n]) * alpha
+    y = bullets.last_y[:n] + (bullets.y[:n] - bullets.last_y[:n]) * alpha
+    xs = (x - bw / 2).tolist()
+    ys = (y - bh / 2).tolist()
+    surface.blits([(bullet_image, pos) for pos in zip(xs, ys)],
+                  doreturn=False)
+
+
+def resolve_collisions(tanks):
     # Prevent tanks from overlapping obstacles or each other.
-    for tank in [t1, t2]:
+    for tank in tanks:
         rect = tank.get_rect()
-        for ob in OBSTACLES:
+        for ob in OBSTACLE_INDEX.near(rect):
             if rect.colliderect(ob):
                 dx_left = rect.right - ob.left
                 dx_right = ob.right - rect.left
@@ -212,9 +264,91 @@ def resolve_collisions(t1: Tank, t2: Tank):
         tank.x = max(TANK_SIZE / 2, min(WIDTH - TANK_SIZE / 2, tank.x))
         tank.y = max(TANK_SIZE / 2, min(HEIGHT - TANK_SIZE / 2, tank.y))
 
-    if t1.get_rect().colliderect(t2.get_rect()):
-        t1.x, t1.y = t1.prev_x, t1.prev_y
-        t2.x, t2.y = t2.prev_x, t2.prev_y
+    for i, t1 in enumerate(tanks):
+        for t2 in tanks[i + 1:]:
+            if t1.get_rect().colliderect(t2.get_rect()):
+                t1.x, t1.y = t1.prev_x, t1.prev_y
+                t2.x, t2.y = t2.prev_x, t2.prev_y
+
+
+# Virtual keys of CPU tanks (set by their CpuController)
+CPU_CONTROLS = {name: name
+                for name in ("left", "right", "forward", "back", "shoot")}
+
+
+class CpuController:
+    # Drives a tank through the same controls a player uses. Every
+    # step think() picks the nearest rival: in sight it aims and fires,
+    # otherwise it follows the shared planner's route toward it, always
+    # heading for the furthest waypoint already in sight. A tank that
+    # stops moving while driving forward backs off for a moment.
+
+    def __init__(self, tank, planner):
+        self.tank = tank
+        self.planner = planner
+        self.keys = dict.fromkeys(CPU_CONTROLS.values(), False)
+        self.stuck_time = 0.0
+        self.reverse_time = 0.0
+
+    def target(self, tanks):
+        tank = self.tank
+        rivals = [t for t in tanks if t is not tank and not t.spinning]
+        rivals = rivals or [t for t in tanks if t is not tank]
+        return min(rivals, key=lambda t: (t.x - tank.x) ** 2
+                   + (t.y - tank.y) ** 2)
+
+    def steer(self, x, y):
+        # Turn toward (x, y); returns the angle still to turn.
+        tank = self.tank
+        wanted = math.degrees(math.atan2(x - tank.x, tank.y - y))
+        diff = (wanted - tank.angle + 180) % 360 - 180
+        self.keys["left"] = diff < -3
+        self.keys["right"] = diff > 3
+        return diff
+
+    def think(self, dt, tanks):
+        tank = self.tank
+        keys = self.keys
+        moved = math.hypot(tank.x - tank.prev_x, tank.y - tank.prev_y)
+        if keys["forward"] and moved < TANK_SPEED * dt * 0.2:
+            self.stuck_time += dt
+        else:
+            self.stuck_time = 0.0
+        for name in keys:
+            keys[name] = False
+        if tank.spinning:
+            return
+        if self.stuck_time > 0.5:
+            self.stuck_time = 0.0
+            self.reverse_time = 0.4
+        if self.reverse_time > 0:
+            self.reverse_time -= dt
+            keys["back"] = True
+            return
+
+        target = self.target(tanks)
+        here = NAV_GRID.nearest_free(NAV_GRID.cell_of(tank.x, tank.y))
+        there = NAV_GRID.nearest_free(NAV_GRID.cell_of(target.x, target.y))
+        if NAV_GRID.line_of_sight(here, there):
+            diff = self.steer(target.x, target.y)
+            distance = math.hypot(target.x - tank.x, target.y - tank.y)
+            keys["forward"] = distance > AI_HOLD_DISTANCE and abs(diff) < 30
+            if (abs(diff) < AI_AIM_TOLERANCE and not target.spinning
+                    and distance < BULLET_SPEED * BULLET_LIFETIME):
+                tank.shoot(bullets)
+            return
+
+        waypoints = self.planner.path(self, (tank.x, tank.y),
+                                      (target.x, target.y))
+        if not waypoints:
+            return  # route still being planned
+        goal = waypoints[0]
+        for cell in reversed(waypoints):
+            if NAV_GRID.line_of_sight(here, cell):
+                goal = cell
+                break
+        diff = self.steer(*NAV_GRID.center(goal))
+        keys["forward"] = abs(diff) < 30
 
 
 # Game Setup
@@ -234,117 +368,122 @@ controls_p2 = {
     "shoot": pygame.K_RCTRL,
 }
 
-p1 = Tank(120, HEIGHT // 2, 0, P1_COLOR, controls_p1, "Player 1")
-p2 = Tank(WIDTH - 120, HEIGHT // 2, 180, P2_COLOR, controls_p2, "Player 2")
-
-bullets = []
-flash_time = 0.0
+p1 = Tank(120, HEIGHT // 2, 0, P1_COLOR, controls_p1, "Player 1", 1)
+p2 = Tank(WIDTH - 120, HEIGHT // 2, 180, P2_COLOR,
+          CPU_CONTROLS if CPU_PLAYER_2 else controls_p2,
+          "CPU" if CPU_PLAYER_2 else "Player 2", 2)
+tanks = [p1, p2]
+for k in range(AI_TANKS):
+    # Bots line up along the top and bottom edges
+    per_row = (AI_TANKS + 1) // 2
+    top = k % 2 == 0
+    tanks.append(Tank(WIDTH * (k // 2 + 1) / (per_row + 1),
+                      TANK_SIZE if top else HEIGHT - TANK_SIZE,
+                      180 if top else 0, (P1_COLOR, P2_COLOR)[k % 2],
+                      CPU_CONTROLS, f"CPU {k + 1}", len(tanks) + 1))
+
+# One planner shares routes, line-of-sight and the A* budget among bots
+planner = core.PathPlanner(NAV_GRID, AI_PLAN_BUDGET)
+controllers = {tank: CpuController(tank, planner)
+               for tank in tanks if tank.controls is CPU_CONTROLS}
+
+# Room for thousands of shells (bullet hell variants)
+BULLET_CAPACITY = 4096
+bullets = core.ProjectileArray(BULLET_CAPACITY)
+# Hit flash, shake and restart fade (no surfaces allocated per frame)
+screen_effects = effects.ScreenEffects((WIDTH, HEIGHT), BG_COLOR)
 winner = None
 game_state = "PLAYING"
 
+# Small font for the free-for-all scoreboard
+small_font = pygame.font.Font("assets/PressStart2P.ttf", 12)
 
-# Main Game Loop
-running = True
-while running:
-    dt = clock.tick(FPS) / 1000.0
-    keys = pygame.key.get_pressed()
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+# Frame profiler (F3 overlay, F4 export)
+profiler = core.FrameProfiler()
 
-        if event.type == pygame.KEYDOWN and game_state == "PLAYING":
-            if event.key == p1.controls["shoot"]:
-                bullet = p1.shoot()
-                if bullet:
-                    bullets.append(bullet)
-            if event.key == p2.controls["shoot"]:
-                bullet = p2.shoot()
-                if bullet:
-                    bullets.append(bullet)
+
+def handle_event(event):
+    if event.type == pygame.KEYDOWN:
+        profiler.handle_key(event.key)
+
+    if event.type == pygame.KEYDOWN and game_state == "PLAYING":
+        for tank in tanks:
+            if event.key == tank.controls["shoot"]:
+                tank.shoot(bullets)
+
+
+def update(dt):
+    # One fixed simulation step.
+    global winner, game_state
+    keys = pygame.key.get_pressed()
+    screen_effects.update(dt)
 
     if game_state == "PLAYING":
-        flash_time = max(0.0, flash_time - dt)
-        p1.update(dt, keys)
-        p2.update(dt, keys)
-        resolve_collisions(p1, p2)
-
-        for bullet in bullets[:]:
-            bullet.life -= dt
-            bullet.x += bullet.vx * dt
-            bullet.y += bullet.vy * dt
-
-            if bullet_hits_obstacle(bullet):
-                bullets.remove(bullet)
-                continue
-
-            if (
-                bullet.x < -10
-                or bullet.x > WIDTH + 10
-                or bullet.y < -10
-                or bullet.y > HEIGHT + 10
-                or bullet.life <= 0
-            ):
-                bullets.remove(bullet)
-                continue
-
-            if not p1.spinning and bullet.owner == 2:
-                if p1.get_rect().collidepoint(int(bullet.x), int(bullet.y)):
-                    p1.hit()
-                    p2.score += 1
-                    bullets.remove(bullet)
-                    flash_time = 0.18
-                    continue
-
-            if not p2.spinning and bullet.owner == 1:
-                if p2.get_rect().collidepoint(int(bullet.x), int(bullet.y)):
-                    p2.hit()
-                    p1.score += 1
-                    bullets.remove(bullet)
-                    flash_time = 0.18
-                    continue
-
-        if p1.score >= WIN_SCORE or p2.score >= WIN_SCORE:
-            winner = "Player 1" if p1.score >= WIN_SCORE else "Player 2"
+        for controller in controllers.values():
+            controller.think(dt, tanks)
+        planner.run()
+        for tank in tanks:
+            controller = controllers.get(tank)
+            tank.update(dt, controller.keys if controller else keys)
+        profiler.lap("update")
+        resolve_collisions(tanks)
+
+        if update_bullets(dt):
+            screen_effects.flash()
+            screen_effects.shake()
+
+        leader = max(tanks, key=lambda t: t.score)
+        if leader.score >= WIN_SCORE:
+            winner = leader.name
             game_state = "MATCH_OVER"
+        profiler.lap("collision")
+
+    elif keys[pygame.K_r]:
+        for tank in tanks:
+            tank.score = 0
+        game_state = "PLAYING"
+        screen_effects.fade(duration=0.4)
 
-    # Drawing
+
+def draw(alpha):
+    # Render one frame; alpha places moving things between two steps.
     screen.fill(BG_COLOR)
 
     for ob in OBSTACLES:
         pygame.draw.rect(screen, OBST_COLOR, ob)
 
-    for bullet in bullets:
-        bullet.draw(screen)
+    draw_bullets(screen, alpha)
 
-    draw_tank(screen, p1)
-    draw_tank(screen, p2)
+    for tank in tanks:
+        draw_tank(screen, tank, alpha)
 
     # Score display
-    core.render_score(
-        screen, score_font, score1_pos, score2_pos,
-        p1.score, p2.score, COLOR_P1, COLOR_P2
-    )
+    if len(tanks) == 2:
+        core.render_score(
+            screen, score_font, score1_pos, score2_pos,
+            p1.score, p2.score, COLOR_P1, COLOR_P2
+        )
+    else:
+        gap = WIDTH // (len(tanks) + 1)
+        for i, tank in enumerate(tanks):
+            color = COLOR_P1 if tank.color == P1_COLOR else COLOR_P2
+            text = core.render_text(small_font, str(tank.score), color)
+            screen.blit(text, (gap * (i + 1), 10))
 
     if game_state == "MATCH_OVER":
-        over = score_font.render(f"{winner} WINS!", True, FLASH_COLOR)
+        over = core.render_text(score_font, f"{winner} WINS!", FLASH_COLOR)
         screen.blit(over,
                     (WIDTH // 2 - over.get_width() // 2, HEIGHT // 2 - 40))
-        info = score_font.render("PRESS R TO RESTART", True, WHITE)
+        info = core.render_text(score_font, "PRESS R TO RESTART", WHITE)
         screen.blit(info,
                     (WIDTH // 2 - info.get_width() // 2, HEIGHT // 2 + 20))
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_r]:
-            p1.score = 0
-            p2.score = 0
-            game_state = "PLAYING"
-
-    elif flash_time > 0:
-        flash = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        alpha = int(140 * (flash_time / 0.18))
-        flash.fill((255, 255, 255, alpha))
-        screen.blit(flash, (0, 0))
-
-    pygame.display.flip()
+
+    screen_effects.draw(screen)
+
+
+# Main Game Loop (60 Hz simulation, interpolated rendering)
+loop = core.GameLoop(clock, step=1 / FPS, render_fps=FPS, profiler=profiler)
+loop.run(handle_event, update, draw)
 
 pygame.quit()
@@ -1,11 +1,23 @@
 import math
 import pygame
+import numpy as np
 import core
-from core import Bullet
+
+# upload images
+PATH_green = "assets/airplaneGreen.png"
+PATH_orange = "assets/airplaneOrange.png"
+PATH_cloud = "assets/nuvem.png"
+airplane_SIZE = 40  # pixels
 
 # Initialize Pygame
 pygame.init()
 pygame.mixer.init()
+# Decode and scale the images while the window and mixer start
+core.ASSETS.preload([
+    (PATH_green, airplane_SIZE * 2),
+    (PATH_cloud, None),
+    (core.BULLET_IMAGE, 8),
+])
 
 # Screen setup
 screen, clock, WIDTH, HEIGHT = core.screen_setup("Warplane Combat")
@@ -13,19 +25,17 @@ screen, clock, WIDTH, HEIGHT = core.screen_setup("Warplane Combat")
 # Scoreboard setup
 score_font, score1_pos, score2_pos = core.scoreboard_setup(WIDTH)
 
-# upload images
-PATH_green = "assets/airplaneGreen.png"
-PATH_orange = "assets/airplaneOrange.png"
-img_G, img_OR, img_bul, sound_bullet = core.load_image(PATH_green, PATH_orange)
-img_cloud = pygame.image.load("assets/nuvem.png").convert_alpha()
+sound_bullet = core.ASSETS.sound(core.BULLET_SOUND)
+img_cloud = core.ASSETS.image(PATH_cloud)
 
-# scale of airplane
-airplane_SIZE = 40  # pixels
-img_w, img_h = img_G.get_size()
-scale = (airplane_SIZE * 2) / max(img_w, img_h)
-new_size = (max(1, int(img_w * scale)), max(1, int(img_h * scale)))
-airplane_green_image = pygame.transform.smoothscale(img_G, new_size)
-airplane_orange_image = pygame.transform.smoothscale(img_OR, new_size)
+# scale of airplane (both planes get the green plane's size)
+airplane_green_image = core.ASSETS.image(PATH_green, airplane_SIZE * 2)
+new_size = airplane_green_image.get_size()
+airplane_orange_image = core.ASSETS.image(PATH_orange, new_size)
+
+# Background: the sky is baked once, clouds are a foreground layer
+# (they pass over the planes), redrawn only where something moved.
+compositor = core.Compositor((WIDTH, HEIGHT), (0, 0, 170))
 
 # cloud setup
 cloud_rect = img_cloud.get_rect()
@@ -39,225 +49,264 @@ pos_cloud_2_x = WIDTH * 3 // 4
 pos_cloud_2_y = HEIGHT // 2
 cloud_rect_2 = cloud_rect.copy()
 cloud_rect_2.center = (pos_cloud_2_x, pos_cloud_2_y)
+compositor.add_layer(img_cloud, cloud_rect_1.topleft)
+compositor.add_layer(img_cloud, cloud_rect_2.topleft)
 
 # Scale bullet image
-bul_image = core.scale_bullet_image(img_bul)
+bul_image = core.scale_bullet_image()
 
 
 # state variables
-initial_angle = 0.0
 speed = 180.0
-initial_rad = math.radians(initial_angle - 270)
-
-# airplane green
-x_green_initial = WIDTH / 2
-y_green_initial = HEIGHT / 2
-x_green = x_green_initial
-y_green = y_green_initial
-vel_x_green = math.sin(initial_rad) * speed
-vel_y_green = -math.cos(initial_rad) * speed
-angle_Green = 0.0
-green_hit_timer = 0.0
-green_respawn_delay = 2.0
-
-# airplane orange
-x_orange_initial = WIDTH / 4
-y_orange_initial = HEIGHT / 4
-x_orange = x_orange_initial
-y_orange = y_orange_initial
-vel_x_orange = math.sin(initial_rad) * speed
-vel_y_orange = -math.cos(initial_rad) * speed
-angle_orange = 0.0
-orange_hit_timer = 0.0
-orange_respawn_delay = 2.0
+respawn_delay = 2.0
 
 # Movement parameters
 ROT_SPEED = 225.0   # degrees per second
+BULLET_SPEED = 900.0
 BULLET_MAX_TRAVEL_DISTANCE = 800
 
-# Lists to hold active bullets
-bullets_green = []
-bullets_orange = []
-
-# Score
-score_green = 0
-score_orange = 0
-
-running = True
-while running:
-    dt = clock.tick(60) / 1000.0  # delta time in seconds
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            # Player Orange fires
-            if event.key == pygame.K_s and not bullets_orange:
-                # Offset bullet starting position slightly from airplane center
-                sound_bullet.play()
-                rad = math.radians(angle_orange - 270)
-                offset = airplane_SIZE / 2
-                bullet_start_x = x_orange + math.sin(rad) * offset
-                bullet_start_y = y_orange - math.cos(rad) * offset
-                bullets_orange.append(
-                    Bullet(
-                        bullet_start_x,
-                        bullet_start_y,
-                        angle_orange,
-                        bul_image,
-                        BULLET_MAX_TRAVEL_DISTANCE,
-                    )
-                )
-
-            # Player Green fires
-            if event.key == pygame.K_DOWN and not bullets_green:
-                # Offset bullet starting position slightly from airplane center
-                sound_bullet.play()
-                bullet_offset = airplane_SIZE / 2
-                rad = math.radians(angle_Green - 270)
-                bullet_start_x = x_green + math.sin(rad) * bullet_offset
-                bullet_start_y = y_green - math.cos(rad) * bullet_offset
-                bullets_green.append(
-                    Bullet(
-                        bullet_start_x,
-                        bullet_start_y,
-                        angle_Green,
-                        bul_image,
-                        BULLET_MAX_TRAVEL_DISTANCE,
-                    )
-                )
-
-    keys = pygame.key.get_pressed()
-
-    # airplane green movement and respawn handling
-    if green_hit_timer <= 0:
-        if keys[pygame.K_LEFT]:
-            angle_Green -= ROT_SPEED * dt
-        if keys[pygame.K_RIGHT]:
-            angle_Green += ROT_SPEED * dt
-        angle_Green = angle_Green % 360
-        rad_green = math.radians(angle_Green - 270)
-        dir_x_green = math.sin(rad_green)
-        dir_y_green = -math.cos(rad_green)
-        vel_x_green = dir_x_green * speed
-        vel_y_green = dir_y_green * speed
-        x_green += vel_x_green * dt
-        y_green += vel_y_green * dt
-
-        # Wrap around screen edges
-        if x_green < 0:
-            x_green += WIDTH
-        elif x_green > WIDTH:
-            x_green -= WIDTH
-        if y_green < 0:
-            y_green += HEIGHT
-        elif y_green > HEIGHT:
-            y_green -= HEIGHT
-    else:
-        green_hit_timer -= dt
-        angle_Green += ROT_SPEED * dt * 4
-        angle_Green = angle_Green % 360
-        if green_hit_timer <= 0:
-            x_green = x_green_initial
-            y_green = y_green_initial
-            angle_Green = 0.0
-
-    # airplane orange movement and respawn handling
-    if orange_hit_timer <= 0:
-        if keys[pygame.K_a]:
-            angle_orange -= ROT_SPEED * dt
-        if keys[pygame.K_d]:
-            angle_orange += ROT_SPEED * dt
-        angle_orange = angle_orange % 360
-        rad_orange = math.radians(angle_orange - 270)
-        dir_x_orange = math.sin(rad_orange)
-        dir_y_orange = -math.cos(rad_orange)
-        vel_x_orange = dir_x_orange * speed
-        vel_y_orange = dir_y_orange * speed
-        x_orange += vel_x_orange * dt
-        y_orange += vel_y_orange * dt
-
-        # Wrap around screen edges
-        if x_orange < 0:
-            x_orange += WIDTH
-        elif x_orange > WIDTH:
-            x_orange -= WIDTH
-        if y_orange < 0:
-            y_orange += HEIGHT
-        elif y_orange > HEIGHT:
-            y_orange -= HEIGHT
-    else:
-        orange_hit_timer -= dt
-        angle_orange += ROT_SPEED * dt * 4
-        angle_orange = angle_orange % 360
-        if orange_hit_timer <= 0:
-            x_orange = x_orange_initial
-            y_orange = y_orange_initial
-            angle_orange = 0.0
-
-    # Update and draw bullets
-    for bullet in bullets_green[:]:
-        if not bullet.update(dt, WIDTH, HEIGHT):
-            bullets_green.remove(bullet)
-
-    for bullet in bullets_orange[:]:
-        if not bullet.update(dt, WIDTH, HEIGHT):
-            bullets_orange.remove(bullet)
-
-    #  Collision Detection
-    green_plane_rect = airplane_green_image.get_rect(
-        center=(int(x_green), int(y_green))
-    )
-    orange_plane_rect = airplane_orange_image.get_rect(
-        center=(int(x_orange), int(y_orange))
-    )
-    #  Collision: Bullets from GREEN hit ORANGE
-    for bullet in bullets_green[:]:
-        if bullet.get_rect().colliderect(orange_plane_rect):
-            score_green += 1
-            orange_hit_timer = orange_respawn_delay
-            bullets_green.remove(bullet)
-            break
-    #  Collision: Bullets from ORANGE hit GREEN
-    for bullet in bullets_orange[:]:
-        if bullet.get_rect().colliderect(green_plane_rect):
-            score_orange += 1
-            green_hit_timer = green_respawn_delay
-            bullets_orange.remove(bullet)
-            break
-
-    # Render (background and rotated ship)
-    screen.fill((0, 0, 170))
-    # airplane green
-    rotated1 = pygame.transform.rotate(airplane_green_image, -angle_Green)
-    rect1 = rotated1.get_rect(center=(x_green, y_green))
-    screen.blit(rotated1, rect1.topleft)
-    # airplane orange
-    rotated2 = pygame.transform.rotate(airplane_orange_image, -angle_orange)
-    rect2 = rotated2.get_rect(center=(x_orange, y_orange))
-    screen.blit(rotated2, rect2.topleft)
-
-    # Draw bullets
-    for bullet in bullets_green:
-        bullet.draw(screen)
-    for bullet in bullets_orange:
-        bullet.draw(screen)
-
-    # Draw clouds
-    screen.blit(img_cloud, cloud_rect_1)
-    screen.blit(img_cloud, cloud_rect_2)
+# Extra CPU planes for free-for-all matches (0 = classic two players)
+AI_PLANES = 0
+
+# Colors of the planes (scores use them)
+ORANGE_COLOR = (210, 105, 30)
+GREEN_COLOR = (0, 170, 0)
+
+
+class PlaneFleet:
+    # N planes stored as NumPy arrays, one element per plane, so
+    # movement, wrapping, respawn and bullet hits run as vectorized
+    # passes instead of code duplicated per player.
+    # Every plane has one bullet slot: it can fire again once its
+    # shot is gone (one shot on screen per player).
+
+    def __init__(self, spawns, images, colors, controls):
+        n = len(spawns)
+        self.n = n
+        self.images = images
+        self.colors = colors
+        self.controls = controls  # key dict per plane, None for CPU
+        self.spawn = np.array(spawns, dtype=float)
+        self.pos = self.spawn.copy()
+        self.prev = self.pos.copy()
+        self.angle = np.zeros(n)
+        self.hit_timer = np.zeros(n)
+        self.score = np.zeros(n, dtype=int)
+        # Bullets, one slot per plane
+        self.shot = np.zeros(n, dtype=bool)
+        self.bullet = np.zeros((n, 2))
+        self.bullet_last = np.zeros((n, 2))
+        self.bullet_vel = np.zeros((n, 2))
+        self.traveled = np.zeros(n)
+        self.plane_w, self.plane_h = images[0].get_size()
+        self.bullet_w, self.bullet_h = bul_image.get_size()
+        self.size = np.array((WIDTH, HEIGHT), dtype=float)
+
+    def fire(self, i):
+        # Shoot from plane i, slightly ahead of its center.
+        if self.shot[i]:
+            return
+        sound_bullet.play()
+        rad = math.radians(self.angle[i] - 270)
+        direction = np.array((math.sin(rad), -math.cos(rad)))
+        self.bullet[i] = self.pos[i] + direction * (airplane_SIZE / 2)
+        self.bullet_last[i] = self.bullet[i]
+        self.bullet_vel[i] = direction * BULLET_SPEED
+        self.traveled[i] = 0.0
+        self.shot[i] = True
+
+    def player_turns(self, keys):
+        # -1/0/+1 turn per plane from the keyboard (0 for CPU planes).
+        turn = np.zeros(self.n)
+        for i, controls in enumerate(self.controls):
+            if controls is None:
+                continue
+            if keys[controls["left"]]:
+                turn[i] -= 1
+            if keys[controls["right"]]:
+                turn[i] += 1
+        return turn
+
+    def cpu_turns(self, turn):
+        # CPU planes turn toward the nearest other plane still flying
+        # and fire when it is roughly ahead.
+        cpu = np.array([c is None for c in self.controls])
+        if not cpu.any():
+            return turn
+        delta = self.pos[None, :, :] - self.pos[:, None, :]
+        dist = np.hypot(delta[..., 0], delta[..., 1])
+        np.fill_diagonal(dist, np.inf)
+        dist[:, self.hit_timer > 0] = np.inf  # downed planes are no target
+        target = dist.argmin(axis=1)
+        rows = np.arange(self.n)
+        dx = delta[rows, target, 0]
+        dy = delta[rows, target, 1]
+        wanted = np.degrees(np.arctan2(dx, -dy))
+        diff = (wanted - (self.angle + 90) + 180) % 360 - 180
+        turn = np.where(cpu, np.sign(diff) * (np.abs(diff) > 3), turn)
+        ready = cpu & (np.abs(diff) < 10) & (self.hit_timer <= 0)
+        ready &= dist[rows, target] < BULLET_MAX_TRAVEL_DISTANCE
+        for i in np.flatnonzero(ready & ~self.shot):
+            self.fire(i)
+        return turn
+
+    def _wrap(self, pos, last=None):
+        # Wrap once around the screen edges (moving "last" along).
+        for axis in (0, 1):
+            low = pos[:, axis] < 0
+            high = pos[:, axis] > self.size[axis]
+            shift = np.where(low, self.size[axis],
+                             np.where(high, -self.size[axis], 0.0))
+            pos[:, axis] += shift
+            if last is not None:
+                last[:, axis] += shift
+
+    def update(self, dt, turn):
+        # Movement and respawn of every plane, then their bullets.
+        self.prev[:] = self.pos
+        flying = self.hit_timer <= 0
+        self.angle[flying] = (self.angle[flying]
+                              + turn[flying] * ROT_SPEED * dt) % 360
+        rad = np.radians(self.angle[flying] - 270)
+        self.pos[flying, 0] += np.sin(rad) * speed * dt
+        self.pos[flying, 1] -= np.cos(rad) * speed * dt
+        self._wrap(self.pos)
+
+        # Hit planes spin until the timer runs out, then respawn
+        spinning = ~flying
+        self.hit_timer[spinning] -= dt
+        self.angle[spinning] = (self.angle[spinning]
+                                + ROT_SPEED * dt * 4) % 360
+        back = spinning & (self.hit_timer <= 0)
+        self.pos[back] = self.spawn[back]
+        self.prev[back] = self.spawn[back]  # no smear on respawn
+        self.angle[back] = 0.0
+
+        # Bullets
+        shot = self.shot
+        self.bullet_last[shot] = self.bullet[shot]
+        step = self.bullet_vel[shot] * dt
+        self.bullet[shot] += step
+        self.traveled[shot] += np.hypot(step[:, 0], step[:, 1])
+        self._wrap(self.bullet, self.bullet_last)
+        self.shot &= self.traveled < BULLET_MAX_TRAVEL_DISTANCE
+
+    def collide(self):
+        # Swept test of every bullet against every other plane, with
+        # the plane rects grown by the bullet size. A bullet scores
+        # on the first plane it crosses; downed planes can't be hit and
+        # a plane hit by several bullets counts one hit (first shooter).
+        cx = self.pos[:, 0].astype(int)
+        cy = self.pos[:, 1].astype(int)
+        left = cx - self.plane_w // 2 - self.bullet_w // 2
+        top = cy - self.plane_h // 2 - self.bullet_h // 2
+        right = left + self.plane_w + self.bullet_w
+        bottom = top + self.plane_h + self.bullet_h
+        hits = core.segment_hits_box(
+            self.bullet_last[:, 0, None], self.bullet_last[:, 1, None],
+            self.bullet[:, 0, None], self.bullet[:, 1, None],
+            left[None], top[None], right[None], bottom[None])
+        np.fill_diagonal(hits, False)
+        hits &= self.shot[:, None]
+        hits &= (self.hit_timer <= 0)[None, :]
+        shooters = np.flatnonzero(hits.any(axis=1))
+        targets = hits[shooters].argmax(axis=1)
+        targets, first = np.unique(targets, return_index=True)
+        shooters = shooters[first]
+        self.score[shooters] += 1
+        self.hit_timer[targets] = respawn_delay
+        self.shot[shooters] = False
+
+    def draw(self, surface, alpha):
+        # Draw planes and bullets; returns the rects drawn.
+        rects = []
+        for i in range(self.n):
+            rect = core.draw_rotated_image(
+                surface, self.images[i], self.angle[i],
+                core.interpolate(self.prev[i, 0], self.pos[i, 0], alpha,
+                                 WIDTH),
+                core.interpolate(self.prev[i, 1], self.pos[i, 1], alpha,
+                                 HEIGHT))
+            rects.append(rect.copy())
+        shot = self.shot
+        pos = self.bullet_last[shot] + \
+            (self.bullet[shot] - self.bullet_last[shot]) * alpha
+        half = (self.bullet_w / 2, self.bullet_h / 2)
+        rects += surface.blits([(bul_image, p)
+                                for p in (pos - half).tolist()])
+        return rects
+
+
+# airplane orange (plane 0) and airplane green (plane 1)
+controls_orange = {"left": pygame.K_a, "right": pygame.K_d,
+                   "fire": pygame.K_s}
+controls_green = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT,
+                  "fire": pygame.K_DOWN}
+spawns = [(WIDTH / 4, HEIGHT / 4), (WIDTH / 2, HEIGHT / 2)]
+images = [airplane_orange_image, airplane_green_image]
+colors = [ORANGE_COLOR, GREEN_COLOR]
+controls = [controls_orange, controls_green]
+for k in range(AI_PLANES):
+    # CPU planes spawn around the center
+    a = 2 * math.pi * k / AI_PLANES
+    spawns.append((WIDTH / 2 + math.cos(a) * HEIGHT / 3,
+                   HEIGHT / 2 + math.sin(a) * HEIGHT / 3))
+    images.append(images[k % 2])
+    colors.append(colors[k % 2])
+    controls.append(None)
+fleet = PlaneFleet(spawns, images, colors, controls)
+
+# Small font for the free-for-all scoreboard
+small_font = pygame.font.Font("assets/PressStart2P.ttf", 12)
+
+# Frame profiler (F3 overlay, F4 export)
+profiler = core.FrameProfiler()
+
+
+def handle_event(event):
+    if event.type == pygame.KEYDOWN:
+        profiler.handle_key(event.key)
+        for i, keys in enumerate(fleet.controls):
+            if keys is not None and event.key == keys["fire"]:
+                fleet.fire(i)
+
+
+def update(dt):
+    # One fixed simulation step.
+    turn = fleet.player_turns(pygame.key.get_pressed())
+    turn = fleet.cpu_turns(turn)
+    fleet.update(dt, turn)
+    profiler.lap("update")
+    fleet.collide()
+    profiler.lap("collision")
+
+
+def draw(alpha):
+    # Render planes, bullets and scores over the restored background
+    # (the compositor adds the clouds); alpha places moving things
+    # between the last two simulation steps.
+    canvas = compositor.scene
+    for rect in fleet.draw(canvas, alpha):
+        compositor.mark(rect)
 
     # Render scores
-    ORANGE_COLOR = (210, 105, 30)
-    GREEN_COLOR = (0, 170, 0)
-    score_text_orange = score_font.render(
-        str(score_orange), True, ORANGE_COLOR
-    )
-    score_text_green = score_font.render(
-        str(score_green), True, GREEN_COLOR
-    )
-    screen.blit(score_text_orange, score1_pos)
-    screen.blit(score_text_green, score2_pos)
-    pygame.display.flip()
+    if fleet.n == 2:
+        for rect in core.render_score(
+            canvas, score_font, score1_pos, score2_pos,
+            fleet.score[0], fleet.score[1], ORANGE_COLOR, GREEN_COLOR
+        ):
+            compositor.mark(rect)
+        return
+    gap = WIDTH // (fleet.n + 1)
+    for i in range(fleet.n):
+        text = core.render_text(small_font, str(fleet.score[i]),
+                                fleet.colors[i])
+        compositor.blit(text, (gap * (i + 1), 10))
+
+
+# Main loop (60 Hz simulation, interpolated rendering)
+loop = core.GameLoop(clock, step=1 / 60, render_fps=60, profiler=profiler,
+                     compositor=compositor)
+loop.run(handle_event, update, draw)
 
 pygame.quit()
@@ -10,7 +10,7 @@ pygame.display.set_caption("Sprites")
 
 # Background
 background = pygame.image.load('assets/screen.png')
-background = pygame.transform.scale(background, screen_size)
+background = pygame.transform.scale(background, screen_size).convert()
 
 
 # Projectile Class
@@ -195,7 +195,9 @@ class main(pygame.sprite.Sprite):
 
 
 # Sprite Creation
-all_sprites = pygame.sprite.Group()
+# RenderUpdates remembers where each sprite was drawn, so only those
+# areas of the background are restored and sent to the display
+all_sprites = pygame.sprite.RenderUpdates()
 megaman = main()
 all_sprites.add(megaman)
 
@@ -206,6 +208,8 @@ clock = pygame.time.Clock()
 FPS = 30
 
 # MAIN LOOP
+screen.blit(background, (0, 0))
+pygame.display.flip()
 running = True
 while running:
     clock.tick(FPS)
@@ -250,9 +254,9 @@ while running:
         megaman.is_animating = False
         megaman.current_frame = 0
 
-    screen.blit(background, (0, 0))
-    all_sprites.draw(screen)
-    pygame.display.flip()
+    all_sprites.clear(screen, background)
+    dirty = all_sprites.draw(screen)
+    pygame.display.update(dirty)
     all_sprites.update()
 
 pygame.quit()
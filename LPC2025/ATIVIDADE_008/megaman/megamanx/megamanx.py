@@ -60,6 +60,7 @@ bullet_sound = pygame.mixer.Sound(bullet_sound_path)
 
 BULLET_SIZE = 25
 bullet_img = pygame.transform.scale(bullet_img, (BULLET_SIZE, BULLET_SIZE))
+bullet_img_left = pygame.transform.flip(bullet_img, True, False)
 
 # Player variables
 action = "stop"
@@ -84,11 +85,17 @@ shoot_cooldown = 0
 ARM_X_FROM_LEFT = 62
 ARM_Y_FROM_TOP = 28
 
+# Areas drawn last frame (the background is restored only there)
+dirty_rects = []
+
 # Main loop
+screen.blit(background, (0, 0))
+pygame.display.flip()
 running = True
 while running:
-    # Draw background
-    screen.blit(background, (0, 0))
+    # Restore background under last frame's sprites
+    for rect in dirty_rects:
+        screen.blit(background, rect, rect)
 
     # Event handling
     for event in pygame.event.get():
@@ -186,18 +193,19 @@ while running:
         current_image = pygame.transform.flip(current_image, True, False)
 
     # Draw player
-    screen.blit(current_image, (player_x, player_y))
+    new_rects = [screen.blit(current_image, (player_x, player_y))]
 
     # Draw bullets
     for bullet in bullets:
         if bullet["dir"] == 1:
-            screen.blit(bullet_img, (bullet["x"], bullet["y"]))
+            image = bullet_img
         else:
-            flipped_bullet = pygame.transform.flip(bullet_img, True, False)
-            screen.blit(flipped_bullet, (bullet["x"], bullet["y"]))
+            image = bullet_img_left
+        new_rects.append(screen.blit(image, (bullet["x"], bullet["y"])))
 
-    # Update display
-    pygame.display.flip()
+    # Update only what changed (old and new positions)
+    pygame.display.update(dirty_rects + new_rects)
+    dirty_rects = new_rects
     clock.tick(30)
 
 pygame.quit()
@@ -0,0 +1,164 @@
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+import config as C
+from headless import Input, Simulation
+
+# Columns of the action array, one row per world
+ACTIONS = ("left", "right", "thrust", "fire", "hyper")
+# Columns of the observation array, one row per world
+STATE = ("score", "lives", "wave", "x", "y", "vx", "vy", "angle",
+         "asteroids", "ufos", "game_over")
+
+
+def world_seeds(seed: int, n: int) -> list[int]:
+    """Independent, reproducible seeds for ``n`` worlds."""
+    return np.random.SeedSequence(seed).generate_state(n).tolist()
+
+
+class WorldBatch:
+    """Several independent headless worlds stepped in lockstep.
+
+    Every world keeps its own ``random`` stream, swapped in around its
+    step, so results do not depend on how worlds are grouped or ordered.
+    """
+
+    def __init__(self, seeds: list[int], dt: float = 1.0 / C.FPS) -> None:
+        outer = random.getstate()
+        self.sims = []
+        self.rng = []
+        for seed in seeds:
+            random.seed(seed)
+            self.sims.append(Simulation(seed=None, dt=dt))
+            self.rng.append(random.getstate())
+        random.setstate(outer)
+        self.state = np.zeros((len(seeds), len(STATE)), dtype=np.float32)
+        for i in range(len(seeds)):
+            self._observe(i, False)
+
+    def __len__(self) -> int:
+        return len(self.sims)
+
+    def _observe(self, i: int, done: bool) -> None:
+        world = self.sims[i].world
+        row = self.state[i]
+        if done:
+            # The world already reset; report the finished game instead
+            row[0], row[2] = world.last_game
+            world.last_game = None
+        else:
+            row[0], row[2] = world.score, world.wave
+        ship = world.ship
+        row[1] = world.lives
+        row[3:5] = ship.store.pos[ship.idx]
+        row[5:7] = ship.store.vel[ship.idx]
+        row[7] = ship.angle
+        row[8] = len(world.asteroids)
+        row[9] = len(world.ufos)
+        row[10] = done
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """Advance every world one tick with an (N, len(ACTIONS)) array."""
+        outer = random.getstate()
+        for i, (sim, row) in enumerate(zip(self.sims, actions.tolist())):
+            random.setstate(self.rng[i])
+            done = sim.step(Input(*map(bool, row)))
+            self.rng[i] = random.getstate()
+            self._observe(i, done)
+        random.setstate(outer)
+        return self.state
+
+    def run(self, actions: np.ndarray) -> np.ndarray:
+        """Step through a (T, N, len(ACTIONS)) array, return (T, N, STATE)."""
+        out = np.empty((len(actions), len(self), len(STATE)), np.float32)
+        for t, frame in enumerate(actions):
+            out[t] = self.step(frame)
+        return out
+
+
+def _worker(conn, seeds: list[int], dt: float) -> None:
+    batch = WorldBatch(seeds, dt)
+    conn.send(batch.state)
+    while True:
+        actions = conn.recv()
+        if actions is None:
+            break
+        conn.send(batch.run(actions))
+    conn.close()
+
+
+class ParallelRunner:
+    """Spread N worlds over worker processes that each own a WorldBatch.
+
+    Workers live as long as the runner, so world state stays in place and
+    only action and observation arrays cross process boundaries.
+    """
+
+    def __init__(self, n_worlds: int, seed: int = 0,
+                 dt: float = 1.0 / C.FPS, processes: int | None = None):
+        processes = min(processes or os.cpu_count() or 1, n_worlds)
+        seeds = world_seeds(seed, n_worlds)
+        self.slices = []
+        self.conns = []
+        self.procs = []
+        for part in np.array_split(np.arange(n_worlds), processes):
+            lo, hi = int(part[0]), int(part[-1]) + 1
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_worker, args=(child, seeds[lo:hi], dt),
+                              daemon=True)
+            proc.start()
+            child.close()
+            self.slices.append(slice(lo, hi))
+            self.conns.append(parent)
+            self.procs.append(proc)
+        self.state = np.concatenate([c.recv() for c in self.conns])
+
+    def run(self, actions: np.ndarray) -> np.ndarray:
+        """Step all worlds through (T, N, len(ACTIONS)) actions in parallel."""
+        for conn, part in zip(self.conns, self.slices):
+            conn.send(np.ascontiguousarray(actions[:, part]))
+        out = np.concatenate([c.recv() for c in self.conns], axis=1)
+        self.state = out[-1]
+        return out
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """Advance every world one tick with an (N, len(ACTIONS)) array."""
+        return self.run(actions[None])[0]
+
+    def close(self) -> None:
+        for conn in self.conns:
+            conn.send(None)
+            conn.close()
+        for proc in self.procs:
+            proc.join()
+        self.conns = []
+        self.procs = []
+
+    def __enter__(self) -> "ParallelRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(n_worlds: int = 64, ticks: int = 600) -> None:
+    rng = np.random.default_rng(0)
+    actions = rng.random((ticks, n_worlds, len(ACTIONS))) < 0.3
+    start = time.perf_counter()
+    with ParallelRunner(n_worlds) as runner:
+        states = runner.run(actions)
+    elapsed = time.perf_counter() - start
+    frames = ticks * n_worlds
+    print(f"{n_worlds} worlds x {ticks} ticks in {elapsed:.2f}s "
+          f"({frames / elapsed:.0f} frames/s)")
+    print(f"mean score {states[-1, :, 0].mean():.1f}, "
+          f"games over {int(states[:, :, -1].sum())}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,179 @@
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pygame as pg
+
+import config as C
+from headless import IDLE, MUTE
+from sprites import BulletPool
+from systems import World
+from utils import Vec, rand_unit_vec
+
+BASE_PATH = Path(__file__).resolve().parent
+
+BASELINE_PATH = BASE_PATH.parent / "benchmarks" / "baseline.json"
+
+SIZES = (10, 100, 1000)
+SEED = 1234
+DT = 1.0 / C.FPS
+
+
+def synthetic_world(n: int, seed: int = SEED) -> World:
+    """World with ``n`` asteroids and ``n`` long-lived player bullets."""
+    random.seed(seed)
+    world = World(sfx=MUTE)
+    world.lives = 10**9  # never reset the world mid-benchmark
+    for asteroid in list(world.asteroids):
+        asteroid.kill()
+    for _ in range(n):
+        pos = Vec(random.uniform(0, C.WIDTH), random.uniform(0, C.HEIGHT))
+        speed = random.uniform(C.AST_VEL_MIN, C.AST_VEL_MAX)
+        size = random.choice(tuple(C.AST_SIZES))
+        world.spawn_asteroid(pos, rand_unit_vec() * speed, size)
+    world.bullets = BulletPool(world.bodies.bullets, capacity=n)
+    reload(world)
+    return world
+
+
+def reload(world: World) -> None:
+    """Refill the bullet pool so every op sees the same bullet load."""
+    pool = world.bullets
+    while pool.free:
+        pos = Vec(random.uniform(0, C.WIDTH), random.uniform(0, C.HEIGHT))
+        pool.acquire(pos, rand_unit_vec() * C.SHIP_BULLET_SPEED)
+    store = pool.store
+    store.ttl[: store.n] = 1e9
+
+
+def op_count(n: int) -> int:
+    """Fixed op count per size, so the workload is identical every run."""
+    return max(5, 20000 // n)
+
+
+def measure(fn, ops: int) -> dict:
+    """Time ``ops`` calls of ``fn``; report ops/s and allocation churn.
+
+    Allocations come from separate passes so the tracing overhead does
+    not pollute the timing: ``alloc_kib_per_op`` is the memory allocated
+    and released within one op (tracemalloc peak above the starting
+    point), ``blocks_per_op`` the allocated blocks an op leaves behind
+    and ``peak_kib`` the highest traced memory of the whole pass.
+    """
+    fn()  # warm caches
+    start = time.perf_counter()
+    for _ in range(ops):
+        fn()
+    elapsed = time.perf_counter() - start
+
+    traced = min(ops, 20)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for _ in range(traced):
+        fn()
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+
+    churn = peak = 0
+    tracemalloc.start()
+    for _ in range(traced):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, top = tracemalloc.get_traced_memory()
+        churn += top - before
+        peak = max(peak, top)
+    tracemalloc.stop()
+    return {
+        "ops_per_sec": ops / elapsed,
+        "alloc_kib_per_op": churn / traced / 1024.0,
+        "blocks_per_op": blocks / traced,
+        "peak_kib": peak / 1024.0,
+    }
+
+
+def run(sizes=SIZES) -> dict:
+    pg.font.init()
+    font = pg.font.Font(None, 20)
+    surf = pg.Surface((C.WIDTH, C.HEIGHT))
+    results = {}
+    for n in sizes:
+        ops = op_count(n)
+        world = synthetic_world(n)
+
+        def update():
+            world.update(DT, IDLE)
+            reload(world)
+        results[f"update/{n}"] = measure(update, ops)
+
+        world = synthetic_world(n)
+
+        def collisions():
+            world.handle_collisions()
+            reload(world)
+        results[f"collisions/{n}"] = measure(collisions, ops)
+
+        world = synthetic_world(n)
+        results[f"draw/{n}"] = measure(lambda: world.draw(surf, font), ops)
+        asteroids = list(world.asteroids)
+        results[f"make_poly/{n}"] = measure(
+            lambda: [a._make_poly() for a in asteroids], ops)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Names of cases whose throughput dropped by more than ``tolerance``."""
+    slower = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base and res["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            slower.append(name)
+    return slower
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Asteroids hot path benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a case is slower than the baseline; "
+                        "ops/s are absolute, so re-save the baseline "
+                        "(--save) on each machine before checking")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes)
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+
+    print(f"{'case':<18}{'ops/s':>12}{'vs base':>9}{'KiB/op':>9}"
+          f"{'blk/op':>9}{'peak KiB':>11}")
+    for name, res in results.items():
+        base = baseline.get(name)
+        ratio = f"{res['ops_per_sec'] / base['ops_per_sec']:.2f}x" if base else "-"
+        print(f"{name:<18}{res['ops_per_sec']:>12.1f}{ratio:>9}"
+              f"{res['alloc_kib_per_op']:>9.2f}{res['blocks_per_op']:>9.1f}"
+              f"{res['peak_kib']:>11.1f}")
+
+    if args.save:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline saved to {BASELINE_PATH}")
+
+    if args.check:
+        slower = compare(results, baseline, args.tolerance)
+        if slower:
+            print("regressions:", ", ".join(slower))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
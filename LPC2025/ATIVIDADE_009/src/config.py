@@ -25,11 +25,23 @@ AST_SIZES = {
     "M": {"r": 24, "score": 50, "split": ["S", "S"]},
     "S": {"r": 12, "score": 100, "split": []},
 }
+AST_MAX_R = max(s["r"] for s in AST_SIZES.values())
+AST_JITTER_MIN = 0.75  # variação do raio dos vértices
+AST_JITTER_MAX = 1.2
+AST_SPIN = 0.0          # deg/s máximo de rotação (0 = sem girar)
+
+# Cache de desenho dos asteroides
+AST_CACHE_SIZE = 512    # asteroides com contorno pré-renderizado
+AST_ROT_FRAMES = 36     # quadros de rotação por asteroide (10 graus)
+
+# Broadphase de colisão (grade espacial)
+GRID_CELL = AST_MAX_R * 2  # px, cobre o maior asteroide em 1 célula
 
 # Tiro
 BULLET_RADIUS = 2
 BULLET_TTL = 1.0
 MAX_BULLETS = 4
+BULLET_POOL = 64  # balas pré-alocadas por lado (player / inimigos)
 
 # UFO
 UFO_SPAWN_EVERY = 15.0  # segundos
@@ -45,5 +57,10 @@ WHITE = (240, 240, 240)
 GRAY = (120, 120, 120)
 BLACK = (0, 0, 0)
 
+# Profiler (F3 mostra/esconde, F4 exporta)
+PROFILE_WINDOW = 600  # quadros nas estatísticas
+PROFILE_CSV = "profile.csv"
+PROFILE_JSON = "profile.json"
+
 # Aleatoriedade
 RANDOM_SEED = None  # ou defina um int para reprodutibilidade
@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+
+import config as C
+
+BOUNDS = np.array([C.WIDTH, C.HEIGHT], dtype=np.float32)
+
+
+class EntityStore:
+    """Structure-of-arrays storage for every body of one kind.
+
+    Rows ``[0, n)`` are alive and packed: removing a body moves the last
+    row into the hole and updates the index of the sprite that owned it.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.n = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.r = np.zeros(capacity, dtype=np.float32)
+        self.ttl = np.full(capacity, np.inf, dtype=np.float32)
+        self.owners: list = [None] * capacity
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _grow(self) -> None:
+        cap = len(self.r) * 2
+        for name in ("pos", "vel", "r", "ttl"):
+            old = getattr(self, name)
+            new = np.empty((cap,) + old.shape[1:], dtype=old.dtype)
+            new[: self.n] = old[: self.n]
+            setattr(self, name, new)
+        self.owners.extend([None] * (cap - len(self.owners)))
+
+    def add(self, owner, pos, vel, r: float, ttl: float = math.inf) -> int:
+        """Append a body and return the row index now owned by ``owner``."""
+        if self.n == len(self.r):
+            self._grow()
+        i = self.n
+        self.pos[i] = pos
+        self.vel[i] = vel
+        self.r[i] = r
+        self.ttl[i] = ttl
+        self.owners[i] = owner
+        self.n += 1
+        return i
+
+    def remove(self, i: int) -> None:
+        """Swap-remove row ``i`` keeping the alive rows contiguous."""
+        last = self.n - 1
+        if i != last:
+            self.pos[i] = self.pos[last]
+            self.vel[i] = self.vel[last]
+            self.r[i] = self.r[last]
+            self.ttl[i] = self.ttl[last]
+            moved = self.owners[last]
+            self.owners[i] = moved
+            moved.idx = i
+        self.owners[last] = None
+        self.n = last
+
+    def integrate(self, dt: float) -> None:
+        """Move, wrap and age every alive body in one vectorized step."""
+        n = self.n
+        if not n:
+            return
+        pos = self.pos[:n]
+        pos += self.vel[:n] * np.float32(dt)
+        np.mod(pos, BOUNDS, out=pos)
+        self.ttl[:n] -= np.float32(dt)
+
+    def snapshot(self) -> list:
+        """(owner, x, y) for every alive row, copied out in one go."""
+        n = self.n
+        pos = self.pos[:n]
+        return list(zip(self.owners[:n], pos[:, 0].tolist(),
+                        pos[:, 1].tolist()))
+
+    def expired(self) -> list:
+        """Owners whose ttl ran out during the last integrate."""
+        rows = np.flatnonzero(self.ttl[: self.n] <= 0)
+        return [self.owners[i] for i in rows]
+
+
+class Bodies:
+    """One EntityStore per entity kind of a World."""
+
+    def __init__(self) -> None:
+        self.ships = EntityStore(capacity=1)
+        self.asteroids = EntityStore()
+        self.bullets = EntityStore(capacity=C.BULLET_POOL)
+        self.enemy_bullets = EntityStore(capacity=C.BULLET_POOL)
+        self.ufos = EntityStore(capacity=4)
+        self.kinds = (self.ships, self.asteroids, self.bullets,
+                      self.enemy_bullets, self.ufos)
+
+    def integrate(self, dt: float) -> None:
+        for store in self.kinds:
+            store.integrate(dt)
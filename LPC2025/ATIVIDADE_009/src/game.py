@@ -6,6 +6,8 @@ from dataclasses import dataclass
 import pygame as pg
 
 import config as C
+from profiler import FrameProfiler
+from render import DirtyRenderer
 from systems import World
 from utils import text
 
@@ -26,11 +28,15 @@ class Game:
         self.font = pg.font.SysFont("consolas", 20)
         self.big = pg.font.SysFont("consolas", 48)
         self.scene = Scene("menu")
-        self.world = World()
+        self.profiler = FrameProfiler(C.PROFILE_WINDOW)
+        self.world = World(profiler=self.profiler)
+        self.renderer = DirtyRenderer()
 
     def run(self):
+        prof = self.profiler
         while True:
             dt = self.clock.tick(C.FPS) / 1000.0
+            prof.begin()
             for e in pg.event.get():
                 if e.type == pg.QUIT:
                     pg.quit()
@@ -38,6 +44,14 @@ class Game:
                 if e.type == pg.KEYDOWN and e.key == pg.K_ESCAPE:
                     pg.quit()
                     sys.exit(0)
+                if e.type == pg.KEYDOWN and e.key == pg.K_F3:
+                    prof.overlay = not prof.overlay
+                    self.renderer.invalidate()
+                    continue
+                if e.type == pg.KEYDOWN and e.key == pg.K_F4:
+                    prof.export_csv(C.PROFILE_CSV)
+                    prof.export_json(C.PROFILE_JSON)
+                    continue
                 if self.scene.name == "play":
                     if e.type == pg.KEYDOWN and e.key == pg.K_SPACE:
                         self.world.try_fire()
@@ -46,17 +60,28 @@ class Game:
                 elif self.scene.name == "menu":
                     if e.type == pg.KEYDOWN:
                         self.scene = Scene("play")
+                        self.renderer.invalidate()
 
             keys = pg.key.get_pressed()
-            self.screen.fill(C.BLACK)
+            prof.lap("input")
 
             if self.scene.name == "menu":
+                self.screen.fill(C.BLACK)
                 self.draw_menu()
+                if prof.overlay:
+                    prof.draw(self.screen, self.font)
+                prof.lap("draw")
+                pg.display.flip()
             elif self.scene.name == "play":
                 self.world.update(dt, keys)
-                self.world.draw(self.screen, self.font)
-
-            pg.display.flip()
+                # Só as áreas que mudaram vão para a tela
+                rects = self.renderer.draw(self.screen, self.world, self.font)
+                if prof.overlay:
+                    rects.append(prof.draw(self.screen, self.font))
+                prof.lap("draw")
+                pg.display.update(rects)
+            prof.lap("flip")
+            prof.end()
 
     def draw_menu(self):
         text(self.screen, self.big, "ASTEROIDS",
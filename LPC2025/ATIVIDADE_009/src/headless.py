@@ -0,0 +1,134 @@
+import random
+import sys
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator
+
+import pygame as pg
+
+import config as C
+from systems import World
+
+
+class _Silent:
+    def play(self, *args, **kwargs) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class Mute:
+    """Drop-in for the ``sounds`` module that never touches the mixer."""
+
+    SHOT = BREAK_LARGE = BREAK_MEDIUM = FLY_BIG = FLY_SMALL = _Silent()
+
+    @staticmethod
+    def play_loop(sound) -> None:
+        return None
+
+
+MUTE = Mute()
+
+
+@dataclass(frozen=True)
+class Input:
+    """One tick of scripted input, indexable like ``pg.key.get_pressed()``."""
+
+    left: bool = False
+    right: bool = False
+    thrust: bool = False
+    fire: bool = False
+    hyper: bool = False
+
+    def __getitem__(self, key: int) -> bool:
+        if key == pg.K_LEFT:
+            return self.left
+        if key == pg.K_RIGHT:
+            return self.right
+        if key == pg.K_UP:
+            return self.thrust
+        return False
+
+
+IDLE = Input()
+
+
+@dataclass
+class Result:
+    ticks: int
+    score: int
+    wave: int
+    game_over: bool
+
+
+class Simulation:
+    """Fixed-step World driver with no display, mixer or wall clock."""
+
+    def __init__(self, seed: int | None = C.RANDOM_SEED,
+                 dt: float = 1.0 / C.FPS) -> None:
+        if seed is not None:
+            random.seed(seed)
+        self.dt = dt
+        self.ticks = 0
+        self.world = World(sfx=MUTE)
+
+    def step(self, inp: Input = IDLE) -> bool:
+        """Advance one tick; return True when the game just ended."""
+        world = self.world
+        if inp.fire:
+            world.try_fire()
+        if inp.hyper:
+            world.hyperspace()
+        world.update(self.dt, inp)
+        self.ticks += 1
+        return world.last_game is not None
+
+    def run(self, script: Iterable[Input], ticks: int | None = None) -> Result:
+        """Feed ``script`` until it ends, ``ticks`` pass or the game is over.
+
+        The world resets itself on game over, so the score and wave of the
+        finished game are reported instead of the fresh world's.
+        """
+        start = self.ticks
+        for inp in islice(script, ticks):
+            if self.step(inp):
+                score, wave = self.world.last_game
+                self.world.last_game = None
+                return Result(self.ticks - start, score, wave, True)
+        world = self.world
+        return Result(self.ticks - start, world.score, world.wave, False)
+
+
+def random_inputs(rng: random.Random) -> Iterator[Input]:
+    """Endless input stream that holds random key combos for a few ticks."""
+    while True:
+        inp = Input(
+            left=rng.random() < 0.3,
+            right=rng.random() < 0.3,
+            thrust=rng.random() < 0.4,
+            fire=rng.random() < 0.5,
+            hyper=rng.random() < 0.01,
+        )
+        for _ in range(rng.randint(1, 20)):
+            yield inp
+
+
+def main(games: int = 100, max_ticks: int = 60 * C.FPS * 5) -> None:
+    start = time.perf_counter()
+    results = []
+    for i in range(games):
+        sim = Simulation(seed=i)
+        results.append(sim.run(random_inputs(random.Random(i)), max_ticks))
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(r.ticks for r in results)
+    print(f"{games} games, {ticks} ticks in {elapsed:.2f}s "
+          f"({ticks / elapsed:.0f} ticks/s)")
+    print(f"mean score {sum(r.score for r in results) / games:.1f}, "
+          f"games over {sum(r.game_over for r in results)}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,97 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame as pg
+
+import config as C
+
+PHASES = ("input", "update", "collision", "draw", "flip")
+
+
+class FrameProfiler:
+    """Per-phase frame timer with rolling percentiles.
+
+    Call ``begin()`` at the top of a frame, ``lap(name)`` after each phase
+    and ``end()`` when the frame is done. Each lap is one perf_counter call
+    and a float store, so it can stay enabled in release builds.
+    """
+
+    def __init__(self, window: int = 600, phases=PHASES) -> None:
+        self.phases = tuple(phases)
+        self.frames: deque = deque(maxlen=window)  # ms per whole frame
+        self.samples = {p: deque(maxlen=window) for p in self.phases}
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self.t0 = self.mark = time.perf_counter()
+        self.overlay = False
+
+    def begin(self) -> None:
+        self.t0 = self.mark = time.perf_counter()
+        for p in self.phases:
+            self.current[p] = 0.0
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous mark to ``phase``."""
+        now = time.perf_counter()
+        self.current[phase] += (now - self.mark) * 1000.0
+        self.mark = now
+
+    def end(self) -> None:
+        self.frames.append((time.perf_counter() - self.t0) * 1000.0)
+        for p in self.phases:
+            self.samples[p].append(self.current[p])
+
+    @staticmethod
+    def percentile(values, q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def stats(self) -> dict:
+        """p50/p95/p99 of the frame time and mean ms of every phase."""
+        frames = self.frames
+        return {
+            "frames": len(frames),
+            "p50": self.percentile(frames, 50),
+            "p95": self.percentile(frames, 95),
+            "p99": self.percentile(frames, 99),
+            "max": max(frames, default=0.0),
+            "phases": {
+                p: sum(s) / len(s) if s else 0.0
+                for p, s in self.samples.items()
+            },
+        }
+
+    def export_csv(self, path: str) -> None:
+        """One row per frame still in the window."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame_ms",) + self.phases)
+            columns = [self.frames] + [self.samples[p] for p in self.phases]
+            for row in zip(*columns):
+                writer.writerow(f"{v:.4f}" for v in row)
+
+    def export_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def overlay_rect(self, font: pg.font.Font) -> pg.Rect:
+        line = font.get_linesize()
+        rows = 1 + len(self.phases)
+        return pg.Rect(10, C.HEIGHT - 10 - line * rows, 260, line * rows)
+
+    def draw(self, surf: pg.Surface, font: pg.font.Font) -> pg.Rect:
+        """Draw the overlay box and return its rect for display.update."""
+        rect = self.overlay_rect(font)
+        surf.fill(C.BLACK, rect)
+        s = self.stats()
+        lines = [f"p50 {s['p50']:.1f}  p95 {s['p95']:.1f}  "
+                 f"p99 {s['p99']:.1f} ms"]
+        lines += [f"{p:<10}{ms:6.2f} ms" for p, ms in s["phases"].items()]
+        y = rect.top
+        for text in lines:
+            surf.blit(font.render(text, True, C.GRAY), (rect.left, y))
+            y += font.get_linesize()
+        return rect
@@ -0,0 +1,140 @@
+import math
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame as pg
+
+import config as C
+
+
+class AsteroidAtlas:
+    """Pre-rendered asteroid outlines with optional rotation frames.
+
+    Each asteroid's jittered polygon is rasterized once into a small
+    surface per rotation frame (lazily, only frames actually shown).
+    Entries are keyed by sprite, dropped when the asteroid dies and
+    evicted least-recently-used first when the cache is full.
+    """
+
+    def __init__(self, max_entries: int = C.AST_CACHE_SIZE,
+                 frames: int = C.AST_ROT_FRAMES) -> None:
+        self.max_entries = max_entries
+        self.frames = max(1, frames)
+        self.entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _rasterize(self, poly, r: float, angle: float) -> pg.Surface:
+        half = math.ceil(r * C.AST_JITTER_MAX) + 1
+        surf = pg.Surface((half * 2, half * 2), pg.SRCALPHA)
+        rad = math.radians(angle)
+        cos, sin = math.cos(rad), math.sin(rad)
+        pts = [(half + p.x * cos - p.y * sin, half + p.x * sin + p.y * cos)
+               for p in poly]
+        pg.draw.polygon(surf, C.WHITE, pts, width=1)
+        if pg.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        return surf
+
+    def frame(self, asteroid) -> pg.Surface:
+        """Surface for the asteroid at its current rotation."""
+        entry = self.entries.get(asteroid)
+        if entry is None:
+            entry = [None] * self.frames
+            self.entries[asteroid] = entry
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(asteroid)
+        step = 360.0 / self.frames
+        k = int(asteroid.angle % 360.0 // step) % self.frames
+        surf = entry[k]
+        if surf is None:
+            surf = entry[k] = self._rasterize(asteroid.poly, asteroid.r,
+                                              k * step)
+        return surf
+
+    def discard(self, asteroid) -> None:
+        self.entries.pop(asteroid, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def job(self, asteroid) -> tuple[pg.Surface, tuple[float, float]]:
+        """(surface, topleft) pair ready for ``Surface.blits``."""
+        frame = self.frame(asteroid)
+        half = frame.get_width() // 2
+        x, y = asteroid.store.pos[asteroid.idx].tolist()
+        return frame, (x - half, y - half)
+
+    def draw(self, surf: pg.Surface, asteroid) -> None:
+        surf.blit(*self.job(asteroid))
+
+    def draw_group(self, surf: pg.Surface, asteroids) -> None:
+        """Draw a whole group with a single ``Surface.blits`` call."""
+        surf.blits([self.job(a) for a in asteroids], doreturn=False)
+
+
+# Shared by every World, like the sounds module
+ASTEROIDS = AsteroidAtlas()
+
+
+def _finish(surf: pg.Surface) -> pg.Surface:
+    if pg.display.get_surface() is not None:
+        return surf.convert_alpha()
+    return surf
+
+
+@lru_cache(maxsize=None)
+def circle_stamp(r: int) -> pg.Surface:
+    """Outline circle of radius ``r`` centered in a (2r+2)² surface."""
+    size = r * 2 + 2
+    surf = pg.Surface((size, size), pg.SRCALPHA)
+    pg.draw.circle(surf, C.WHITE, (r + 1, r + 1), r, width=1)
+    return _finish(surf)
+
+
+@lru_cache(maxsize=None)
+def ufo_stamp(r: int) -> pg.Surface:
+    """UFO hull and cup centered in a (2r+2)² surface."""
+    size = r * 2 + 2
+    surf = pg.Surface((size, size), pg.SRCALPHA)
+    w, h = r * 2, r
+    rect = pg.Rect(0, 0, w, h)
+    rect.center = (r + 1, r + 1)
+    pg.draw.ellipse(surf, C.WHITE, rect, width=1)
+    cup = pg.Rect(0, 0, w * 0.5, h * 0.7)
+    cup.center = (r + 1, r + 1 - h * 0.3)
+    pg.draw.ellipse(surf, C.WHITE, cup, width=1)
+    return _finish(surf)
+
+
+class DirtyRenderer:
+    """Redraw only what moved and push just those rects to the display.
+
+    The rects drawn last frame are cleared to the background, the world
+    is drawn again and both old and new rects are returned for
+    ``pg.display.update``. The first frame after ``invalidate`` is full.
+    """
+
+    def __init__(self, background=C.BLACK) -> None:
+        self.background = background
+        self.prev: list[pg.Rect] = []
+        self.full = True
+
+    def invalidate(self) -> None:
+        self.full = True
+
+    def draw(self, surf: pg.Surface, world, font: pg.font.Font) -> list:
+        if self.full:
+            surf.fill(self.background)
+            dirty = [surf.get_rect()]
+            self.full = False
+        else:
+            dirty = self.prev
+            for rect in dirty:
+                surf.fill(self.background, rect)
+        world.draw(surf, font)
+        self.prev = world.dirty_rects()
+        return dirty + self.prev
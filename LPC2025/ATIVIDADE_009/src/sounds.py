@@ -20,6 +20,14 @@ def load_sound(filename: str, volume: float = 1.0) -> pg.mixer.Sound:
     return sound
 
 
+def play_loop(sound: pg.mixer.Sound) -> pg.mixer.Channel | None:
+    """Loop a sound on a free channel, returning it so it can be stopped."""
+    channel = pg.mixer.find_channel()
+    if channel is not None:
+        channel.play(sound, loops=-1)
+    return channel
+
+
 # Init mixer and load all sounds
 init_mixer()
 
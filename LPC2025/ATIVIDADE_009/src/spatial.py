@@ -0,0 +1,113 @@
+from typing import Iterator
+
+import numpy as np
+
+import config as C
+from entities import EntityStore
+from utils import Vec
+
+
+class SpatialHash:
+    """Uniform grid over the wrapped playfield used as collision broadphase.
+
+    Cell indices are taken modulo the grid size, so a query that crosses
+    a screen edge continues on the opposite side, just like the sprites.
+    """
+
+    def __init__(self, cell: float = C.GRID_CELL) -> None:
+        self.cols = max(1, int(C.WIDTH // cell))
+        self.rows = max(1, int(C.HEIGHT // cell))
+        # Stretch cells so the grid tiles the screen exactly and wraps clean
+        self.cw = C.WIDTH / self.cols
+        self.ch = C.HEIGHT / self.rows
+        self.cells: dict[int, list] = {}
+        # Snapshot of the bucketed rows, as plain Python values
+        self.owners: list = []
+        self.xs: list[float] = []
+        self.ys: list[float] = []
+        self.radii: list[float] = []
+        self.max_r = 0.0
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.owners = []
+        self.xs, self.ys, self.radii = [], [], []
+        self.max_r = 0.0
+
+    def rebuild(self, store: EntityStore) -> None:
+        """Drop the previous frame and bucket every body of ``store``.
+
+        Cell keys are computed for all rows at once from the position
+        array; bodies are filed by the cell that contains their center.
+        Positions and radii are copied out once here, so the narrowphase
+        in near() reads floats instead of building vectors per test.
+        """
+        self.clear()
+        cells = self.cells
+        n = store.n
+        if not n:
+            return
+        pos = store.pos[:n]
+        self.owners = store.owners[:n]
+        self.xs = pos[:, 0].tolist()
+        self.ys = pos[:, 1].tolist()
+        self.radii = store.r[:n].tolist()
+        self.max_r = max(self.radii)
+        cx = (pos[:, 0] // self.cw).astype(np.intp) % self.cols
+        cy = (pos[:, 1] // self.ch).astype(np.intp) % self.rows
+        for i, key in enumerate((cx * self.rows + cy).tolist()):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+
+    def query(self, pos: Vec, radius: float) -> Iterator:
+        """Yield every object whose cell overlaps the given circle.
+
+        Objects are filed by their center only, so callers must include
+        the largest radius of the stored kind in ``radius``.
+        """
+        owners = self.owners
+        for i in self._rows(pos[0], pos[1], radius):
+            yield owners[i]
+
+    def near(self, x: float, y: float, reach: float,
+             own_radius: bool = True) -> Iterator:
+        """Yield the objects whose center is closer than ``reach`` to
+        (x, y), plus their own radius when ``own_radius`` is set.
+
+        Distances use the nearest wrapped copy of each center, so bodies
+        touching across a screen edge collide like the grid says they do.
+        """
+        xs, ys, radii, owners = self.xs, self.ys, self.radii, self.owners
+        w, h = C.WIDTH, C.HEIGHT
+        extra = self.max_r if own_radius else 0.0
+        for i in self._rows(x, y, reach + extra):
+            dx = abs(xs[i] - x)
+            if dx > w / 2:
+                dx = w - dx
+            dy = abs(ys[i] - y)
+            if dy > h / 2:
+                dy = h - dy
+            limit = reach + radii[i] if own_radius else reach
+            if dx * dx + dy * dy < limit * limit:
+                yield owners[i]
+
+    def _rows(self, x: float, y: float, radius: float) -> Iterator[int]:
+        """Rows filed in the cells overlapping the given circle."""
+        x0 = int((x - radius) // self.cw)
+        x1 = int((x + radius) // self.cw)
+        y0 = int((y - radius) // self.ch)
+        y1 = int((y + radius) // self.ch)
+        # Never visit the same wrapped column/row twice
+        x1 = min(x1, x0 + self.cols - 1)
+        y1 = min(y1, y0 + self.rows - 1)
+        cells = self.cells
+        rows = self.rows
+        for cx in range(x0, x1 + 1):
+            base = (cx % self.cols) * rows
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get(base + cy % rows)
+                if bucket:
+                    yield from bucket
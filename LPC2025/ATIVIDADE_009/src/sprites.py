@@ -1,52 +1,153 @@
-
 import math
 from random import uniform
 
 import pygame as pg
 
 import config as C
-from utils import Vec, angle_to_vec, draw_circle, draw_poly, wrap_pos
+import render
+from entities import EntityStore
+from utils import Vec, angle_to_vec, draw_circle, draw_poly
+
+
+class StoreView:
+    """pos/vel views over the EntityStore row at ``self.idx``."""
+
+    __slots__ = ()
+
+    @property
+    def pos(self) -> Vec:
+        if self.idx < 0:
+            return Vec(self._last_pos)
+        return Vec(self.store.pos[self.idx].tolist())
+
+    @pos.setter
+    def pos(self, value: Vec) -> None:
+        self.store.pos[self.idx] = value
+
+    @property
+    def vel(self) -> Vec:
+        if self.idx < 0:
+            return Vec(0, 0)
+        return Vec(self.store.vel[self.idx].tolist())
+
+    @vel.setter
+    def vel(self, value: Vec) -> None:
+        self.store.vel[self.idx] = value
+
+    def bounds(self) -> pg.Rect:
+        """Screen area touched by draw(), for dirty rectangles."""
+        x, y = self.store.pos[self.idx].tolist()
+        e = self.extent
+        return pg.Rect(int(x) - e, int(y) - e, e * 2, e * 2)
+
+    def blit_job(self, stamp: pg.Surface) -> tuple[pg.Surface, tuple]:
+        """(stamp, topleft) pair centering ``stamp`` on the body."""
+        x, y = self.store.pos[self.idx].tolist()
+        half = stamp.get_width() // 2
+        return stamp, (x - half, y - half)
+
+    def _release(self) -> None:
+        if self.idx >= 0:
+            self._last_pos = self.store.pos[self.idx].tolist()
+            self.store.remove(self.idx)
+            self.idx = -1
 
-import sounds
 
+class Body(StoreView, pg.sprite.Sprite):
+    """Sprite whose pos/vel live in a row of an EntityStore."""
 
-class Bullet(pg.sprite.Sprite):
-    def __init__(self, pos: Vec, vel: Vec):
+    def __init__(self, store: EntityStore, pos: Vec, vel: Vec, r: float,
+                 ttl: float = math.inf):
         super().__init__()
-        self.pos = Vec(pos)
-        self.vel = Vec(vel)
-        self.ttl = C.BULLET_TTL
+        self.store = store
+        self.r = r
+        self.idx = store.add(self, pos, vel, r, ttl)
+        self.extent = r + 2  # half size of what draw() touches
+
+    def kill(self) -> None:
+        self._release()
+        super().kill()
+
+
+class Bullet(StoreView):
+    """Pooled bullet; get one with BulletPool.acquire, never construct."""
+
+    __slots__ = ("pool", "store", "idx", "r", "extent", "_last_pos")
+
+    def __init__(self, pool: "BulletPool"):
+        self.pool = pool
+        self.store = pool.store
+        self.idx = -1
         self.r = C.BULLET_RADIUS
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        self.extent = self.r + 2
+        self._last_pos = (0.0, 0.0)
 
-    def update(self, dt: float):
-        self.pos += self.vel * dt
-        self.pos = wrap_pos(self.pos)
-        self.ttl -= dt
-        if self.ttl <= 0:
-            self.kill()
-        self.rect.center = self.pos
+    @property
+    def ttl(self) -> float:
+        return float(self.store.ttl[self.idx]) if self.idx >= 0 else 0.0
+
+    def alive(self) -> bool:
+        return self.idx >= 0
+
+    def kill(self) -> None:
+        self.pool.release(self)
+
+    def stamp(self) -> pg.Surface:
+        return render.circle_stamp(self.r)
 
     def draw(self, surf: pg.Surface):
-        draw_circle(surf, self.pos, self.r)
+        surf.blit(*self.blit_job(self.stamp()))
 
 
-class Asteroid(pg.sprite.Sprite):
-    def __init__(self, pos: Vec, vel: Vec, size: str):
-        super().__init__()
-        self.pos = Vec(pos)
-        self.vel = Vec(vel)
+class BulletPool:
+    """Fixed-capacity bullets recycled through a free list.
+
+    Every Bullet is created up front; firing pops one from the free list
+    and claims a row of the pool's EntityStore, killing gives both back.
+    Stands in for a sprite Group: len(), iteration and nothing else.
+    """
+
+    def __init__(self, store: EntityStore,
+                 capacity: int = C.BULLET_POOL) -> None:
+        self.store = store
+        self.capacity = capacity
+        self.free = [Bullet(self) for _ in range(capacity)]
+
+    def __len__(self) -> int:
+        return self.store.n
+
+    def __iter__(self):
+        return iter(self.store.owners[: self.store.n])
+
+    def acquire(self, pos: Vec, vel: Vec) -> Bullet | None:
+        """Fire a bullet, or return None when the pool is exhausted."""
+        if not self.free:
+            return None
+        bullet = self.free.pop()
+        bullet.idx = self.store.add(bullet, pos, vel, bullet.r, C.BULLET_TTL)
+        return bullet
+
+    def release(self, bullet: Bullet) -> None:
+        if bullet.idx >= 0:
+            bullet._release()
+            self.free.append(bullet)
+
+
+class Asteroid(Body):
+    def __init__(self, store: EntityStore, pos: Vec, vel: Vec, size: str):
+        super().__init__(store, pos, vel, C.AST_SIZES[size]["r"])
         self.size = size  # 'L' | 'M' | 'S'
-        self.r = C.AST_SIZES[size]["r"]
         self.poly = self._make_poly()
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        self.angle = 0.0
+        self.spin = uniform(-C.AST_SPIN, C.AST_SPIN) if C.AST_SPIN else 0.0
+        self.extent = math.ceil(self.r * C.AST_JITTER_MAX) + 2
 
     def _make_poly(self):
         steps = 12 if self.size == "L" else 10 if self.size == "M" else 8
         pts = []
         for i in range(steps):
             ang = i * (360 / steps)
-            jitter = uniform(0.75, 1.2)
+            jitter = uniform(C.AST_JITTER_MIN, C.AST_JITTER_MAX)
             r = self.r * jitter
             v = Vec(math.cos(math.radians(ang)),
                     math.sin(math.radians(ang)))
@@ -54,48 +155,50 @@ class Asteroid(pg.sprite.Sprite):
         return pts
 
     def update(self, dt: float):
-        self.pos += self.vel * dt
-        self.pos = wrap_pos(self.pos)
-        self.rect.center = self.pos
+        # Movement happens in EntityStore.integrate; only the spin is left
+        self.angle += self.spin * dt
 
     def draw(self, surf: pg.Surface):
-        pts = [(self.pos + p) for p in self.poly]
-        pg.draw.polygon(surf, C.WHITE, pts, width=1)
+        render.ASTEROIDS.draw(surf, self)
 
+    def kill(self) -> None:
+        render.ASTEROIDS.discard(self)
+        super().kill()
 
-class Ship(pg.sprite.Sprite):
-    def __init__(self, pos: Vec):
-        super().__init__()
-        self.pos = Vec(pos)
-        self.vel = Vec(0, 0)
+
+class Ship(Body):
+    def __init__(self, store: EntityStore, pos: Vec):
+        super().__init__(store, pos, Vec(0, 0), C.SHIP_RADIUS)
         self.angle = -90.0
         self.cool = 0.0
         self.invuln = 0.0
         self.alive = True
-        self.r = C.SHIP_RADIUS
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
+        self.extent = self.r + 8  # inclui o círculo de invulnerabilidade
 
     def control(self, keys: pg.key.ScancodeWrapper, dt: float):
         if keys[pg.K_LEFT]:
             self.angle -= C.SHIP_TURN_SPEED * dt
         if keys[pg.K_RIGHT]:
             self.angle += C.SHIP_TURN_SPEED * dt
+        vel = self.vel
         if keys[pg.K_UP]:
-            self.vel += angle_to_vec(self.angle) * C.SHIP_THRUST * dt
-        self.vel *= C.SHIP_FRICTION
+            vel += angle_to_vec(self.angle) * C.SHIP_THRUST * dt
+        self.vel = vel * C.SHIP_FRICTION
 
-    def fire(self) -> Bullet | None:
+    def fire(self, pool: BulletPool) -> Bullet | None:
         if self.cool > 0:
             return None
         dirv = angle_to_vec(self.angle)
         pos = self.pos + dirv * (self.r + 6)
         vel = self.vel + dirv * C.SHIP_BULLET_SPEED
-        self.cool = C.SHIP_FIRE_RATE
-        return Bullet(pos, vel)
+        bullet = pool.acquire(pos, vel)
+        if bullet is not None:
+            self.cool = C.SHIP_FIRE_RATE
+        return bullet
 
     def hyperspace(self):
         self.pos = Vec(uniform(0, C.WIDTH), uniform(0, C.HEIGHT))
-        self.vel.xy = (0, 0)
+        self.vel = Vec(0, 0)
         self.invuln = 1.0
 
     def update(self, dt: float):
@@ -103,38 +206,34 @@ class Ship(pg.sprite.Sprite):
             self.cool -= dt
         if self.invuln > 0:
             self.invuln -= dt
-        self.pos += self.vel * dt
-        self.pos = wrap_pos(self.pos)
-        self.rect.center = self.pos
 
     def draw(self, surf: pg.Surface):
+        pos = self.pos
         dirv = angle_to_vec(self.angle)
         left = angle_to_vec(self.angle + 140)
         right = angle_to_vec(self.angle - 140)
-        p1 = self.pos + dirv * self.r
-        p2 = self.pos + left * self.r * 0.9
-        p3 = self.pos + right * self.r * 0.9
+        p1 = pos + dirv * self.r
+        p2 = pos + left * self.r * 0.9
+        p3 = pos + right * self.r * 0.9
         draw_poly(surf, [p1, p2, p3])
         if self.invuln > 0 and int(self.invuln * 10) % 2 == 0:
-            draw_circle(surf, self.pos, self.r + 6)
+            draw_circle(surf, pos, self.r + 6)
 
 
 # Em src/sprites.py
 
-class UFO(pg.sprite.Sprite):
-    def __init__(self, pos: Vec, small: bool, target_pos: Vec = None):
-        super().__init__()
-        self.pos = Vec(pos)
+class UFO(Body):
+    def __init__(self, store: EntityStore, pos: Vec, small: bool,
+                 target_pos: Vec = None, sfx=None):
+        pos = Vec(pos)
         self.small = small
-        self.r = C.UFO_SMALL["r"] if small else C.UFO_BIG["r"]
         self.speed = C.UFO_SPEED
-        self.rect = pg.Rect(0, 0, self.r * 2, self.r * 2)
 
         # --- LÓGICA DE MOVIMENTO (AQUI ESTÁ A MUDANÇA) ---
         if self.small and target_pos is not None:
             # NAVE PEQUENA: "Trajectory Shot"
             # Calcula o vetor que aponta da nave inimiga para o jogador AGORA.
-            desired_dir = target_pos - self.pos
+            desired_dir = target_pos - pos
             
             # Normaliza (transforma em tamanho 1, mantendo a direção)
             if desired_dir.length() > 0:
@@ -153,30 +252,31 @@ class UFO(pg.sprite.Sprite):
             # NAVE GRANDE (ou sem alvo):
             # Comportamento Clássico: horizontal com leve inclinação vertical aleatória
             # Se nasceu na esquerda (x < width/2), vai pra direita (1), senão pra esquerda (-1)
-            direction_x = 1 if self.pos.x < C.WIDTH / 2 else -1
+            direction_x = 1 if pos.x < C.WIDTH / 2 else -1
             direction_y = uniform(-0.5, 0.5) # Leve movimento vertical
             self.dir = Vec(direction_x, direction_y).normalize()
         # ----------------------------------------------------
 
+        r = C.UFO_SMALL["r"] if small else C.UFO_BIG["r"]
+        super().__init__(store, pos, self.dir * self.speed, r)
+
         # Configuração do Tiro (Mantivemos igual)
         self.shoot_timer = uniform(0, 1.0)
         self.shoot_delay = C.UFO_FIRE_RATE_SMALL if small else C.UFO_FIRE_RATE_BIG
 
         # Som
-        self.channel = pg.mixer.find_channel()
-        if self.channel is not None:
-            engine_sound = sounds.FLY_SMALL if self.small else sounds.FLY_BIG
-            self.channel.play(engine_sound, loops=-1)
+        self.channel = None
+        if sfx is not None:
+            engine_sound = sfx.FLY_SMALL if self.small else sfx.FLY_BIG
+            self.channel = sfx.play_loop(engine_sound)
 
     # ... (O resto dos métodos update, fire, draw, kill continuam IGUAIS ao passo anterior) ...
     def update(self, dt: float):
-        self.pos += self.dir * self.speed * dt
-        self.pos = wrap_pos(self.pos)
-        self.rect.center = self.pos
         if self.shoot_timer > 0:
             self.shoot_timer -= dt
 
-    def fire(self, target_pos: Vec = None) -> Bullet | None:
+    def fire(self, pool: BulletPool,
+             target_pos: Vec = None) -> Bullet | None:
         if self.shoot_timer > 0: return None
         self.shoot_timer = self.shoot_delay
         angle = 0.0
@@ -188,16 +288,13 @@ class UFO(pg.sprite.Sprite):
         dirv = angle_to_vec(angle)
         spawn_pos = self.pos + dirv * (self.r + 10)
         vel = dirv * C.UFO_BULLET_SPEED
-        return Bullet(spawn_pos, vel)
+        return pool.acquire(spawn_pos, vel)
+
+    def stamp(self) -> pg.Surface:
+        return render.ufo_stamp(self.r)
 
     def draw(self, surf: pg.Surface):
-        w, h = self.r * 2, self.r
-        rect = pg.Rect(0, 0, w, h)
-        rect.center = self.pos
-        pg.draw.ellipse(surf, C.WHITE, rect, width=1)
-        cup = pg.Rect(0, 0, w * 0.5, h * 0.7)
-        cup.center = (self.pos.x, self.pos.y - h * 0.3)
-        pg.draw.ellipse(surf, C.WHITE, cup, width=1)
+        surf.blit(*self.blit_job(self.stamp()))
 
     def kill(self) -> None:
         if hasattr(self, "channel") and self.channel is not None:
@@ -4,23 +4,42 @@ from random import uniform
 import pygame as pg
 
 import config as C
-import sounds
-from sprites import Asteroid, Ship, UFO
-from utils import Vec, rand_edge_pos, rand_unit_vec
+import render
+from entities import Bodies
+from spatial import SpatialHash
+from sprites import Asteroid, BulletPool, Ship, UFO
+from utils import TEXT, Vec, rand_edge_pos, rand_unit_vec
+
+HUD_RECT = pg.Rect(0, 0, C.WIDTH, 51)  # placar + linha divisória
 
 
 class World:
-    def __init__(self) -> None:
+    def __init__(self, sfx=None, profiler=None) -> None:
+        # Sound effects; the headless mode passes a silent stand-in
+        if sfx is None:
+            import sounds as sfx
+        self.sfx = sfx
+        self.profiler = profiler  # FrameProfiler opcional
+        self.last_game = None  # (score, wave) of the last finished game
+
+        # Array-backed positions/velocities, one store per entity kind
+        self.bodies = Bodies()
+
         # Main sprite groups
-        self.ship = Ship(Vec(C.WIDTH / 2, C.HEIGHT / 2))
-        self.bullets = pg.sprite.Group()
-        self.enemy_bullets = pg.sprite.Group()
+        self.ship = Ship(self.bodies.ships, Vec(C.WIDTH / 2, C.HEIGHT / 2))
+        self.bullets = BulletPool(self.bodies.bullets)
+        self.enemy_bullets = BulletPool(self.bodies.enemy_bullets)
         self.asteroids = pg.sprite.Group()
         self.ufos = pg.sprite.Group()
         self.all_sprites = pg.sprite.Group()
 
         self.all_sprites.add(self.ship)
 
+        # Broadphase de colisão, uma grade por grupo
+        self.ast_grid = SpatialHash()
+        self.enemy_grid = SpatialHash()
+        self.ufo_grid = SpatialHash()
+
         # Game state
         self.score = 0
         self.lives = C.START_LIVES
@@ -47,7 +66,7 @@ class World:
 
     def spawn_asteroid(self, pos: Vec, vel: Vec, size: str) -> None:
         """Spawn a new asteroid of a given size."""
-        asteroid = Asteroid(pos, vel, size)
+        asteroid = Asteroid(self.bodies.asteroids, pos, vel, size)
         self.asteroids.add(asteroid)
         self.all_sprites.add(asteroid)
 
@@ -64,7 +83,7 @@ class World:
         target_pos = self.ship.pos if self.ship.alive else Vec(C.WIDTH/2, C.HEIGHT/2)
         
         # Passamos o target_pos para a classe UFO
-        ufo = UFO(Vec(x, y), small, target_pos) 
+        ufo = UFO(self.bodies.ufos, Vec(x, y), small, target_pos, self.sfx)
         
         self.ufos.add(ufo)
         self.all_sprites.add(ufo)
@@ -74,40 +93,45 @@ class World:
         if len(self.bullets) >= C.MAX_BULLETS:
             return
 
-        bullet = self.ship.fire()
+        bullet = self.ship.fire(self.bullets)
         if bullet is None:
             return
 
-        self.bullets.add(bullet)
-        self.all_sprites.add(bullet)
-
         # Play shooting sound
-        sounds.SHOT.play()
+        self.sfx.SHOT.play()
 
     def hyperspace(self) -> None:
         """Teleport the ship to a random position."""
         if not self.ship.alive:
             return
 
-        self.ship.pos.xy = (
+        self.ship.pos = Vec(
             uniform(0, C.WIDTH),
             uniform(0, C.HEIGHT),
         )
-        self.ship.vel.xy = (0, 0)
+        self.ship.vel = Vec(0, 0)
 
     def update(self, dt: float, keys: pg.key.ScancodeWrapper) -> None:
         """Update world state."""
         # Update ship control and all sprite logic
         self.ship.control(keys, dt)
-        self.all_sprites.update(dt)
+        # Integrate and wrap every body at once, then expire old bullets
+        self.bodies.integrate(dt)
+        for pool in (self.bullets, self.enemy_bullets):
+            for bullet in pool.store.expired():
+                pool.release(bullet)
+        # Only timers (and asteroid spin) are left per sprite
+        self.ship.update(dt)
+        for ufo in self.ufos:
+            ufo.update(dt)
+        if C.AST_SPIN:
+            for asteroid in self.asteroids:
+                asteroid.update(dt)
         
         player_pos = self.ship.pos if self.ship.alive else None
         for ufo in self.ufos:
             # Chama a função fire() que criamos no sprites.py
-            bullet = ufo.fire(player_pos)
-            if bullet:
-                self.enemy_bullets.add(bullet) # Adiciona no grupo de tiros inimigos
-                self.all_sprites.add(bullet)   # Adiciona para desenhar na tela
+            ufo.fire(self.enemy_bullets, player_pos)
 
         # Timers
         if self.safe > 0:
@@ -121,7 +145,12 @@ class World:
             self.spawn_ufo()
             self.ufo_timer = C.UFO_SPAWN_EVERY
 
+        prof = self.profiler
+        if prof:
+            prof.lap("update")
         self.handle_collisions()
+        if prof:
+            prof.lap("collision")
 
         # Waves
         if not self.asteroids and self.wave_cool <= 0:
@@ -132,52 +161,59 @@ class World:
 
     def handle_collisions(self) -> None:
         """Handle all collisions between objects."""
-        
+        # Broadphase: reconstrói as grades com as posições deste frame
+        self.ast_grid.rebuild(self.bodies.asteroids)
+        self.enemy_grid.rebuild(self.bodies.enemy_bullets)
+        self.ufo_grid.rebuild(self.bodies.ufos)
+
         # --- 1. Balas do Player vs Asteroides ---
-        hits = pg.sprite.groupcollide(
-            self.asteroids,
-            self.bullets,
-            False, # Asteroides não somem direto (usamos split_asteroid)
-            True,  # Balas somem
-            collided=lambda a, b: (a.pos - b.pos).length() < a.r,
-        )
-        for asteroid, _ in hits.items():
+        # Cada bala consulta só os asteroides das células vizinhas
+        # (posições lidas uma vez do store, sem criar Vec por teste)
+        hit_asteroids = {}
+        for bullet, x, y in self.bodies.bullets.snapshot():
+            for asteroid in self.ast_grid.near(x, y, 0.0):
+                hit_asteroids[asteroid] = True
+                bullet.kill()  # Balas somem
+                break
+        for asteroid in hit_asteroids:
             self.split_asteroid(asteroid)
 
         # --- 2. Colisões que matam o Player ---
         # Só checa se o player não estiver invulnerável (renascendo)
         if self.ship.invuln <= 0 and self.safe <= 0:
-            
+            ship = self.ship
+            ship_rows = ship.store.pos
+
             # Player vs Asteroides
-            for asteroid in self.asteroids:
-                if (asteroid.pos - self.ship.pos).length() < (asteroid.r + self.ship.r):
+            x, y = ship_rows[ship.idx].tolist()
+            for asteroid in self.ast_grid.near(x, y, ship.r):
+                if asteroid.alive():
                     self.ship_die()
                     break
 
             # Player vs UFOs
-            if self.ship.alive:
-                for ufo in self.ufos:
-                    if (ufo.pos - self.ship.pos).length() < (ufo.r + self.ship.r):
-                        self.ship_die()
-                        break
-            
+            if ship.alive:
+                x, y = ship_rows[ship.idx].tolist()
+                for ufo in self.ufo_grid.near(x, y, ship.r):
+                    self.ship_die()
+                    break
+
             # Player vs Balas Inimigas (Enemy Bullets)
-            if self.ship.alive:
-                # Checa se alguma bala inimiga tocou no player
-                hits = pg.sprite.spritecollide(
-                    self.ship, 
-                    self.enemy_bullets, 
-                    True, # A bala some ao bater
-                    collided=pg.sprite.collide_circle # Usa o raio/rect para colisão
-                )
-                if hits:
+            if ship.alive:
+                # Mesmo alcance do collide_circle (meia diagonal do rect)
+                hit = False
+                reach = (ship.r + C.BULLET_RADIUS) * math.sqrt(2)
+                x, y = ship_rows[ship.idx].tolist()
+                for bullet in list(self.enemy_grid.near(x, y, reach, False)):
+                    bullet.kill()  # A bala some ao bater
+                    hit = True
+                if hit:
                     self.ship_die()
 
         # --- 3. Balas do Player vs UFOs ---
-        # (Usa listas manuais para calcular a distância circular customizada)
-        for ufo in list(self.ufos):
-            for bullet in list(self.bullets):
-                if (ufo.pos - bullet.pos).length() < (ufo.r + bullet.r):
+        for bullet, x, y in self.bodies.bullets.snapshot():
+            for ufo in self.ufo_grid.near(x, y, bullet.r):
+                if ufo.alive():
                     score = (
                         C.UFO_SMALL["score"]
                         if ufo.small
@@ -186,33 +222,29 @@ class World:
                     self.score += score
                     ufo.kill()
                     bullet.kill()
+                    break
 
-        # --- 4. UFOs vs Asteroides (Onde estava o erro) ---
-        # Verifica colisão entre UFOs e Asteroides
-        crashes = pg.sprite.groupcollide(
-            self.ufos,
-            self.asteroids,
-            True,  # O UFO morre imediatamente
-            False, # O Asteroide será dividido manualmente
-            collided=lambda u, a: (u.pos - a.pos).length() < (u.r + a.r)
-        )
-
-        for ufo, asteroids_hit in crashes.items():
-            # Para o som do UFO se ele morrer
-            if hasattr(ufo, "channel") and ufo.channel:
-                ufo.channel.stop()
-            
-            # Divide os asteroides que ele bateu
-            for asteroid in asteroids_hit:
-                self.split_asteroid(asteroid)
+        # --- 4. UFOs vs Asteroides ---
+        # O UFO morre imediatamente, o asteroide é dividido manualmente
+        crashes = {}
+        for ufo, x, y in self.bodies.ufos.snapshot():
+            hit = [
+                a for a in self.ast_grid.near(x, y, ufo.r) if a.alive()
+            ]
+            if hit:
+                ufo.kill()  # Também para o som do UFO
+                crashes.update(dict.fromkeys(hit))
+
+        for asteroid in crashes:
+            self.split_asteroid(asteroid)
 
     def split_asteroid(self, asteroid: Asteroid) -> None:
         """Split an asteroid into smaller pieces and add score."""
         # Play asteroid break sound
         if asteroid.size == "L":
-            sounds.BREAK_LARGE.play()
+            self.sfx.BREAK_LARGE.play()
         else:
-            sounds.BREAK_MEDIUM.play()
+            self.sfx.BREAK_MEDIUM.play()
 
         self.score += C.AST_SIZES[asteroid.size]["score"]
         split_sizes = C.AST_SIZES[asteroid.size]["split"]
@@ -231,27 +263,33 @@ class World:
             return
 
         # Sound of ship explosion (reuse large break)
-        sounds.BREAK_LARGE.play()
+        self.sfx.BREAK_LARGE.play()
 
         self.lives -= 1
         self.ship.alive = False
 
         # Respawn or reset game
         if self.lives >= 0:
-            self.ship.pos.xy = (C.WIDTH / 2, C.HEIGHT / 2)
-            self.ship.vel.xy = (0, 0)
+            self.ship.pos = Vec(C.WIDTH / 2, C.HEIGHT / 2)
+            self.ship.vel = Vec(0, 0)
             self.ship.angle = -90.0
             self.ship.invuln = C.SAFE_SPAWN_TIME
             self.safe = C.SAFE_SPAWN_TIME
             self.ship.alive = True
         else:
-            # Reset everything
-            self.__init__()
+            # Reset everything, keeping the result of the finished game
+            result = (self.score, self.wave)
+            self.__init__(self.sfx, self.profiler)
+            self.last_game = result
 
     def draw(self, surf: pg.Surface, font: pg.font.Font) -> None:
         """Draw all sprites and HUD."""
-        for spr in self.all_sprites:
-            spr.draw(surf)
+        # Asteroides, balas e UFOs pré-renderizados, num único blits
+        jobs = [render.ASTEROIDS.job(a) for a in self.asteroids]
+        for group in (self.bullets, self.enemy_bullets, self.ufos):
+            jobs.extend(spr.blit_job(spr.stamp()) for spr in group)
+        surf.blits(jobs, doreturn=False)
+        self.ship.draw(surf)
 
         pg.draw.line(
             surf,
@@ -261,6 +299,20 @@ class World:
             width=1,
         )
 
-        txt = f"SCORE {self.score:06d}   LIVES {self.lives}   WAVE {self.wave}"
-        label = font.render(txt, True, C.WHITE)
-        surf.blit(label, (10, 10))
+        # Rótulos fixos e números vêm do cache de texto
+        x = 10
+        for label, value, width in (("SCORE ", self.score, 6),
+                                    ("   LIVES ", self.lives, 0),
+                                    ("   WAVE ", self.wave, 0)):
+            for piece in (TEXT.render(font, label),
+                          TEXT.number(font, value, width)):
+                surf.blit(piece, (x, 10))
+                x += piece.get_width()
+
+    def dirty_rects(self) -> list[pg.Rect]:
+        """Areas touched by draw(): every sprite plus the HUD band."""
+        rects = [spr.bounds() for spr in self.all_sprites]
+        for pool in (self.bullets, self.enemy_bullets):
+            rects.extend(b.bounds() for b in pool)
+        rects.append(HUD_RECT)
+        return rects
@@ -1,5 +1,6 @@
 
 import math
+from collections import OrderedDict
 from random import random, uniform
 from typing import Iterable, Tuple
 
@@ -42,7 +43,60 @@ def draw_circle(surface: pg.Surface, pos: Vec, r: int):
     pg.draw.circle(surface, C.WHITE, pos, r, width=1)
 
 
+class TextCache:
+    """LRU cache of rendered text keyed by (font, string, color).
+
+    Numbers are assembled from cached per-digit glyphs, so a changing
+    score never goes back to the font rasterizer.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _store(self, key, surf: pg.Surface) -> pg.Surface:
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+    def render(self, font: pg.font.Font, s: str,
+               color=C.WHITE) -> pg.Surface:
+        key = (font, s, color)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            return surf
+        return self._store(key, font.render(s, True, color))
+
+    def number(self, font: pg.font.Font, value: int, width: int = 0,
+               color=C.WHITE) -> pg.Surface:
+        """Render ``value`` zero-padded to ``width`` from digit glyphs."""
+        s = f"{value:0{width}d}"
+        key = (font, s, color)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            return surf
+        glyphs = [self.render(font, ch, color) for ch in s]
+        w = sum(g.get_width() for g in glyphs)
+        h = max(g.get_height() for g in glyphs)
+        surf = pg.Surface((w, h), pg.SRCALPHA)
+        x = 0
+        for g in glyphs:
+            surf.blit(g, (x, 0))
+            x += g.get_width()
+        return self._store(key, surf)
+
+
+# Shared by the menu and the HUD
+TEXT = TextCache()
+
+
 def text(surface: pg.Surface, font: pg.font.Font, s: str, x: int, y: int):
-    surf = font.render(s, True, C.WHITE)
+    surf = TEXT.render(font, s)
     rect = surf.get_rect(topleft=(x, y))
     surface.blit(surf, rect)